@@ -1,8 +1,13 @@
 
-import json
+import asyncio
+import atexit
 import os
 import logging
-from bot_config import BotConfig
+import threading
+from time import monotonic
+from typing import Optional, Tuple
+from bot_config import CONFIG
+from json_store import atomic_write, dumps, loads
 
 logger = logging.getLogger(__name__)
 
@@ -10,48 +15,109 @@ class AdminManager:
     """Manages bot administrators and admin-related functionality"""
 
     def __init__(self):
-        self.config = BotConfig()
+        self.config = CONFIG
         self.admin_file = self.config.ADMIN_FILE
-        self.ensure_data_directory()
+        self._dirty = False
+        self._last_flush = monotonic()
+        self._flush_handle = None
+        # Saves can run from the auto-save worker thread and the event loop
+        self._save_lock = threading.Lock()
+        self._admins_tuple: Optional[Tuple[int, ...]] = None
         self.load_admins()
-
-    def ensure_data_directory(self):
-        """Ensure the data directory exists"""
-        if not os.path.exists(self.config.DATA_DIR):
-            os.makedirs(self.config.DATA_DIR)
-            logger.info(f"Created data directory: {self.config.DATA_DIR}")
+        # Make sure batched mutations reach the disk on interpreter exit
+        atexit.register(self.flush)
 
     def load_admins(self):
         """Load admin data from JSON file or initialize empty"""
         try:
-            if os.path.exists(self.admin_file):
-                with open(self.admin_file, 'r') as f:
-                    data = json.load(f)
-                    self.admins = set(data.get('admins', []))
-                    self.log_channel_id = data.get('log_channel_id', None)
-                logger.info(f"Loaded admin data from file: {len(self.admins)} admins")
-            else:
-                self.admins = set()
-                self.log_channel_id = None
-                self.save_admins()
-                logger.info("Initialized empty admin data")
+            with open(self.admin_file, 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
+            self.admins = set()
+            self.log_channel_id = None
+            self.save_admins()
+            logger.info("Initialized empty admin data")
+            return
+        except OSError as e:
+            logger.error("Error loading admins: %s", e)
+            self.admins = set()
+            self.log_channel_id = None
+            return
+
+        try:
+            data = loads(raw)
+            # IDs as ints, so is_admin stays a single hash lookup even if the file holds strings
+            self.admins = self.parse_admin_ids(data.get('admins', ()))
+            self.log_channel_id = data.get('log_channel_id')
+            logger.info("Loaded admin data from file: %s admins", len(self.admins))
         except Exception as e:
-            logger.error(f"Error loading admins: {e}")
+            logger.error("Error loading admins: %s", e)
             self.admins = set()
             self.log_channel_id = None
 
+    @staticmethod
+    def parse_admin_ids(admin_ids) -> set:
+        """Convert admin IDs to ints, dropping (and logging) entries that aren't valid IDs"""
+        admins = set()
+        for admin_id in admin_ids:
+            try:
+                admins.add(int(admin_id))
+            except (TypeError, ValueError):
+                logger.warning("Skipping invalid admin ID: %r", admin_id)
+        return admins
+
     def save_admins(self):
-        """Save admin data to JSON file"""
+        """Save admin data to JSON file (atomically, via a temporary file)"""
+        with self._save_lock:
+            # Cleared before taking the snapshot, so changes made while writing mark the data dirty again
+            self._dirty = False
+            try:
+                data = {
+                    'admins': list(self.admins),
+                    'log_channel_id': self.log_channel_id
+                }
+                atomic_write(self.admin_file, dumps(data, pretty=bool(os.getenv('ADMIN_JSON_PRETTY'))))
+                self._last_flush = monotonic()
+                logger.info("Saved admin data to file")
+            except Exception as e:
+                self._dirty = True
+                logger.error("Error saving admins: %s", e)
+
+    def _mark_dirty(self):
+        """Flag pending changes and save now if the flush interval has elapsed
+
+        Otherwise a single trailing flush is armed for the end of the interval, so
+        every batch of changes reaches the disk within ADMIN_FLUSH_INTERVAL_SECONDS.
+        """
+        self._dirty = True
+        remaining = self.config.ADMIN_FLUSH_INTERVAL_SECONDS - (monotonic() - self._last_flush)
+        if remaining <= 0:
+            self.save_admins()
+            return
+        if self._flush_handle is not None:
+            return
         try:
-            data = {
-                'admins': list(self.admins),
-                'log_channel_id': self.log_channel_id
-            }
-            with open(self.admin_file, 'w') as f:
-                json.dump(data, f, indent=2)
-            logger.info("Saved admin data to file")
-        except Exception as e:
-            logger.error(f"Error saving admins: {e}")
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to run a timer (startup, shutdown), write right away
+            self.save_admins()
+            return
+        self._flush_handle = loop.call_later(remaining, self._flush_later)
+
+    def _flush_later(self):
+        """Trailing flush timer callback"""
+        self._flush_handle = None
+        self.flush()
+
+    @property
+    def dirty(self) -> bool:
+        """Whether there are admin changes not yet written to disk"""
+        return self._dirty
+
+    def flush(self):
+        """Write pending admin changes to disk, if any"""
+        if self._dirty:
+            self.save_admins()
 
     def is_admin(self, user_id: int) -> bool:
         """Check if a user is an admin"""
@@ -60,27 +126,37 @@ class AdminManager:
     def add_admin(self, user_id: int):
         """Add a user as admin"""
         self.admins.add(user_id)
-        self.save_admins()
-        logger.info(f"Added admin: {user_id}")
+        self._admins_tuple = None
+        self._mark_dirty()
+        logger.info("Added admin: %s", user_id)
 
     def remove_admin(self, user_id: int):
         """Remove admin permissions from a user"""
-        if user_id in self.admins:
-            self.admins.remove(user_id)
-            self.save_admins()
-            logger.info(f"Removed admin: {user_id}")
-            return True
-        return False
+        before = len(self.admins)
+        self.admins.discard(user_id)
+        if len(self.admins) == before:
+            return False
+        self._admins_tuple = None
+        self._mark_dirty()
+        logger.info("Removed admin: %s", user_id)
+        return True
+
+    def get_admins(self) -> Tuple[int, ...]:
+        """Get all admin user IDs (cached until the admin set changes)"""
+        if self._admins_tuple is None:
+            self._admins_tuple = tuple(self.admins)
+        return self._admins_tuple
 
-    def get_admins(self) -> list:
-        """Get list of all admin user IDs"""
-        return list(self.admins)
+    @property
+    def admin_count(self) -> int:
+        """Number of admins"""
+        return len(self.admins)
 
     def set_log_channel(self, channel_id: int):
         """Set the log channel for transactions"""
         self.log_channel_id = channel_id
-        self.save_admins()
-        logger.info(f"Set log channel: {channel_id}")
+        self._mark_dirty()
+        logger.info("Set log channel: %s", channel_id)
 
     def get_log_channel(self) -> int:
         """Get the log channel ID"""
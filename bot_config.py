@@ -4,6 +4,9 @@ import os
 class BotConfig:
     """Configuration class for the crypto bot"""
 
+    # Settings are class attributes only; instances carry no per-object state
+    __slots__ = ()
+
     # Data directory
     DATA_DIR = "data"
 
@@ -11,6 +14,8 @@ class BotConfig:
     INITIAL_PRICE = 3000.0
     MINIMUM_PRICE = 1000.0  # Prix minimum en dessous duquel les crypto ne peuvent pas descendre
     CURRENCIES = ['buxcoin', 'bitcoin']
+    VALID_CURRENCIES = frozenset(CURRENCIES)  # For membership checks on user input
+    PRICE_HISTORY_LIMIT = 100  # History entries kept per currency
 
     # Price fluctuation ranges (équilibré et plus réaliste)
     INCREASE_MIN_PERCENT = 0.001  # 0.1%
@@ -23,8 +28,21 @@ class BotConfig:
     USERS_FILE = os.path.join(DATA_DIR, "users.json")
     ADMIN_FILE = os.path.join(DATA_DIR, "admin.json")
 
+    # Minimum delay between two admin file writes (mutations in between are batched)
+    ADMIN_FLUSH_INTERVAL_SECONDS = 1.0
+
+    # Delay before users/prices changes are written (mutations in between share one write)
+    SAVE_DEBOUNCE_SECONDS = 1.0
+
     # User settings
     INITIAL_BALANCE = 0.0
+    TRANSACTION_HISTORY_LIMIT = 50  # Transactions kept per wallet
 
     # Scheduler settings - Update every 10 minutes
     UPDATE_INTERVAL_MINUTES = 10  # Every 10 minutes
+
+# Shared configuration instance, use this instead of instantiating BotConfig
+CONFIG = BotConfig()
+
+# Create the data directory once, at import time, for all managers
+os.makedirs(CONFIG.DATA_DIR, exist_ok=True)
@@ -1,67 +1,123 @@
-from flask import Flask, jsonify, request
+from flask import Flask, g, jsonify, request
+import json
 import os
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to Flask's jsonify
+    orjson = None
+
 app = Flask(__name__)
 
+def json_response(obj, status=200):
+    """Serialize obj to a JSON response, using orjson when available"""
+    if orjson is None:
+        return jsonify(obj), status
+    return app.response_class(orjson.dumps(obj), status=status, mimetype='application/json')
+
+def json_prefix(obj):
+    """Pre-encode a static payload so only a timestamp has to be appended per request"""
+    body = orjson.dumps(obj) if orjson else json.dumps(obj).encode()
+    return body[:-1] + b',"timestamp":"'
+
+def timestamped_response(prefix):
+    """Build a JSON response from a json_prefix() payload and the request timestamp"""
+    return app.response_class(prefix + g.ts.encode() + b'"}', mimetype='application/json')
+
+# Static payloads, encoded once at import time
+HOME_PREFIX = json_prefix({
+    "message": "Bienvenue sur l'API Flask du CryptoBot",
+    "endpoints": [
+        "/",
+        "/api/status",
+        "/api/info",
+        "/api/test",
+        "/ping"
+    ]
+})
+STATUS_PREFIX = json_prefix({
+    "status": "online",
+    "service": "CryptoBot Flask API"
+})
+INFO_PREFIX = json_prefix({
+    "name": "CryptoBot Flask API",
+    "version": "1.0.0",
+    "description": "API Flask pour le bot Discord de cryptomonnaies"
+})
+
+@app.before_request
+def stamp_request():
+    """Compute the response timestamp once per request"""
+    g.ts = datetime.now().isoformat()
+
 @app.route('/')
 def home():
     """Page d'accueil"""
-    return jsonify({
-        "message": "Bienvenue sur l'API Flask du CryptoBot",
-        "timestamp": datetime.now().isoformat(),
-        "endpoints": [
-            "/",
-            "/api/status",
-            "/api/info",
-            "/api/test",
-            "/ping"
-        ]
-    })
+    return timestamped_response(HOME_PREFIX)
 
 @app.route('/api/status')
 def status():
     """Endpoint de statut"""
-    return jsonify({
-        "status": "online",
-        "service": "CryptoBot Flask API",
-        "timestamp": datetime.now().isoformat()
-    })
+    return timestamped_response(STATUS_PREFIX)
 
 @app.route('/api/info')
 def info():
     """Informations sur l'API"""
-    return jsonify({
-        "name": "CryptoBot Flask API",
-        "version": "1.0.0",
-        "description": "API Flask pour le bot Discord de cryptomonnaies",
-        "timestamp": datetime.now().isoformat()
-    })
+    return timestamped_response(INFO_PREFIX)
 
 @app.route('/api/test', methods=['GET', 'POST'])
 def test():
     """Endpoint de test qui accepte GET et POST"""
     if request.method == 'GET':
-        return jsonify({
+        return json_response({
             "method": "GET",
             "message": "Test endpoint fonctionnel",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": g.ts
         })
     elif request.method == 'POST':
         data = request.get_json() if request.is_json else {}
-        return jsonify({
+        return json_response({
             "method": "POST",
             "message": "Données reçues avec succès",
             "received_data": data,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": g.ts
         })
 
+# Immutable /ping response, built once and returned as is on every request
+PONG_RESPONSE = app.response_class(b'Pong!', status=200, mimetype='text/plain')
+PONG_RESPONSE.headers['Cache-Control'] = 'no-store'
+
 @app.route('/ping')
 def ping():
     """Endpoint ping simple"""
-    return 'Pong!', 200
+    return PONG_RESPONSE
+
+def run_production_server(host, port):
+    """Serve the app with gunicorn (multi-worker, threaded)"""
+    from gunicorn.app.base import BaseApplication
+
+    class StandaloneApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f"{host}:{port}")
+            self.cfg.set('workers', os.cpu_count() or 1)
+            self.cfg.set('worker_class', 'gthread')
+            self.cfg.set('threads', 4)
+
+        def load(self):
+            return app
+
+    StandaloneApplication().run()
 
 if __name__ == '__main__':
     # Port dynamique pour Replit
     port = int(os.getenv('PORT', 8080))
-    app.run(host='0.0.0.0', port=port, debug=True)
\ No newline at end of file
+
+    if os.getenv('FLASK_DEBUG'):
+        app.run(host='0.0.0.0', port=port, debug=True)
+    else:
+        try:
+            run_production_server('0.0.0.0', port)
+        except ImportError:
+            # gunicorn is not available (e.g. on Windows), use the Werkzeug server
+            app.run(host='0.0.0.0', port=port)
\ No newline at end of file
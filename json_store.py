@@ -0,0 +1,68 @@
+import json
+import math
+import os
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib json module
+    orjson = None
+
+def loads(raw):
+    """Decode JSON from bytes or str"""
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def check_finite(obj):
+    """Raise ValueError if obj holds an inf/nan float anywhere in its dicts and lists"""
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                raise ValueError(f"Out of range float values are not JSON compliant: {item!r}")
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+
+def dumps(obj, pretty: bool = False) -> bytes:
+    """Encode obj to compact (or indented) JSON bytes
+
+    Integer dict keys are written as strings, like the stdlib json module does.
+    Non-finite floats (inf/nan) raise ValueError with either encoder.
+    """
+    if orjson:
+        # orjson would silently write inf/nan as null
+        check_finite(obj)
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if pretty:
+        return json.dumps(obj, indent=2, allow_nan=False).encode()
+    return json.dumps(obj, separators=(',', ':'), allow_nan=False).encode()
+
+def read_json(path: str):
+    """Read a JSON file with a single read and decode it"""
+    # Unbuffered: FileIO.readall sizes its buffer from fstat and reads straight
+    # into it, without going through a BufferedReader or a text decode pass
+    with open(path, 'rb', buffering=0) as f:
+        return loads(f.read())
+
+def atomic_write(path: str, payload: bytes):
+    """Write payload to path via a fsynced temporary file and an atomic rename
+
+    Readers only ever see the old or the new file, never a truncated one.
+    """
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
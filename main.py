@@ -1,23 +1,136 @@
 import discord
+from discord import app_commands
 from discord.ext import commands
 import asyncio
+import functools
 import os
 import logging
-import json
+import math
+import re
 import signal
 from datetime import datetime, timedelta
-from bot_config import BotConfig
+from string import Template
+from time import monotonic, time
+from bot_config import CONFIG
 from price_manager import PriceManager
 from scheduler import PriceScheduler
 from user_manager import UserManager
 from admin_manager import AdminManager
+from json_store import atomic_write, dumps, read_json
 from aiohttp import web
+from aiohttp.log import access_logger
 import aiohttp_cors
 
+try:
+    import uvloop
+except ImportError:  # Not available on Windows; the default asyncio loop is used
+    uvloop = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Ticket threads/channels are recognised by "ticket" anywhere in their name
+TICKET_NAME_RE = re.compile(r'ticket', re.IGNORECASE)
+
+# Timestamp shared by the web API responses within the same wall-clock second
+_iso_now_cache = (None, "")
+
+def iso_now():
+    """Current local time as an ISO string, at one-second resolution"""
+    global _iso_now_cache
+    second = int(time())
+    if _iso_now_cache[0] != second:
+        _iso_now_cache = (second, datetime.fromtimestamp(second).isoformat())
+    return _iso_now_cache[1]
+
+def json_response(data, status=200):
+    """JSON response encoded with json_store (orjson when available)"""
+    return web.Response(body=dumps(data), status=status, content_type='application/json')
+
+INTERNAL_ERROR_BODY = dumps({"error": "Internal server error"})
+PONG_BODY = b'Pong!'
+
+@web.middleware
+async def json_errors(request, handler):
+    """Turn unexpected handler errors into a JSON 500 response"""
+    try:
+        return await handler(request)
+    except web.HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in {request.path} endpoint: {e}")
+        return web.Response(body=INTERNAL_ERROR_BODY, status=500, content_type='application/json')
+
+# Discord accepts at most 10 embeds in one message
+LOG_EMBEDS_PER_MESSAGE = 10
+
+# Transaction logs waiting to be posted; beyond this (log channel unreachable) new ones are dropped
+LOG_QUEUE_MAXSIZE = 1000
+
+# How long users fetched from the API are reused by resolve_users
+FETCHED_USER_TTL_SECONDS = 600
+
+# Status page served on /, re-rendered at most every ROOT_PAGE_CACHE_SECONDS
+ROOT_PAGE_CACHE_SECONDS = 5
+ROOT_PAGE_TEMPLATE = Template("""
+<!DOCTYPE html>
+<html>
+<head>
+    <title>CryptoBot Status</title>
+    <meta charset="UTF-8">
+    <style>
+        body { font-family: Arial, sans-serif; margin: 40px; background: #f5f5f5; }
+        .container { max-width: 800px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+        h1 { color: #333; text-align: center; }
+        .status { padding: 20px; border-radius: 5px; margin: 20px 0; }
+        .online { background: #d4edda; border-left: 5px solid #28a745; }
+        .info { background: #d1ecf1; border-left: 5px solid #17a2b8; }
+        .endpoint { background: #f8f9fa; padding: 15px; margin: 10px 0; border-radius: 5px; border-left: 3px solid #007bff; }
+        code { background: #e9ecef; padding: 2px 5px; border-radius: 3px; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>🤖 CryptoBot Status</h1>
+        
+        <div class="status online">
+            <h3>✅ Bot Status: Online</h3>
+            <p>Le bot Discord fonctionne correctement et est prêt à recevoir des commandes.</p>
+        </div>
+        
+        <div class="status info">
+            <h3>📊 Informations</h3>
+            <p><strong>Serveurs connectés:</strong> $guilds</p>
+            <p><strong>Latence:</strong> $latency</p>
+            <p><strong>Utilisateur:</strong> $user</p>
+        </div>
+        
+        <div class="status info">
+            <h3>🔗 API Endpoints</h3>
+            <div class="endpoint">
+                <strong>GET /status</strong><br>
+                <code>Statut détaillé du bot en JSON</code>
+            </div>
+            <div class="endpoint">
+                <strong>GET /prices</strong><br>
+                <code>Prix actuels des cryptomonnaies en JSON</code>
+            </div>
+            <div class="endpoint">
+                <strong>GET /stats</strong><br>
+                <code>Statistiques générales du bot en JSON</code>
+            </div>
+        </div>
+        
+        <div class="status info">
+            <h3>💰 Commandes Discord</h3>
+            <p>Utilisez <code>/help</code> dans Discord pour voir toutes les commandes disponibles.</p>
+        </div>
+    </div>
+</body>
+</html>
+""")
+
 class CryptoBot(commands.Bot):
     def __init__(self):
         intents = discord.Intents.default()
@@ -31,6 +144,25 @@ class CryptoBot(commands.Bot):
         self.user_manager = UserManager()
         self.admin_manager = AdminManager()
 
+        # Rendered status page cache for handle_root
+        self._root_html = b''
+        self._root_rendered_at = float('-inf')
+
+        # Cached /prices embed fields, keyed by the price state they were built from
+        self._prices_embed_cache = (None, None)
+
+        # Encoded /health body, keyed by (timestamp second, ready state)
+        self._health_cache = (None, b'')
+
+        # Strong references to fire-and-forget tasks so they are not garbage collected
+        self._background_tasks = set()
+
+        # Transaction log embeds waiting for transaction_log_task (created in setup_hook)
+        self._log_queue = None
+
+        # Users fetched from the API by resolve_users: user_id -> (fetched_at, user)
+        self._fetched_users = {}
+
         # Restore from latest backup if available
         self.restore_latest_backup()
 
@@ -55,9 +187,58 @@ class CryptoBot(commands.Bot):
         asyncio.create_task(self.scheduler.start_scheduler())
         # Start auto-save task
         asyncio.create_task(self.auto_save_task())
+        # Start the transaction log poster
+        self._log_queue = asyncio.Queue(maxsize=LOG_QUEUE_MAXSIZE)
+        asyncio.create_task(self.transaction_log_task())
         # Start web server
         asyncio.create_task(self.start_web_server())
 
+    def create_background_task(self, coro):
+        """Run a coroutine in the background without awaiting it"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    async def resolve_users(self, user_ids):
+        """Look up several users at once: client cache first, then concurrent API fetches
+
+        Returns a dict mapping each ID to its User, or None if it could not be fetched.
+        """
+        now = monotonic()
+        resolved = {}
+        missing = []
+        for user_id in user_ids:
+            user = self.get_user(user_id)
+            if user is None:
+                fetched_at, user = self._fetched_users.get(user_id, (None, None))
+                if fetched_at is None or now - fetched_at >= FETCHED_USER_TTL_SECONDS:
+                    missing.append(user_id)
+                    continue
+            resolved[user_id] = user
+
+        if missing:
+            results = await asyncio.gather(
+                *(self.fetch_user(user_id) for user_id in missing),
+                return_exceptions=True
+            )
+            for user_id, result in zip(missing, results):
+                if isinstance(result, Exception):
+                    resolved[user_id] = None
+                else:
+                    resolved[user_id] = result
+                    self._fetched_users[user_id] = (now, result)
+        return resolved
+
+    async def send_help_later(self, target, delay=1):
+        """Send /help in a new ticket once it had time to be fully created"""
+        try:
+            await asyncio.sleep(delay)
+            await target.send("/help")
+            logger.info(f"Auto-sent /help in ticket: {target.name}")
+        except Exception as e:
+            logger.error(f"Error sending /help in ticket {target.name}: {e}")
+
     async def on_ready(self):
         """Called when the bot has successfully connected to Discord"""
         logger.info(f'{self.user} has connected to Discord!')
@@ -76,9 +257,9 @@ class CryptoBot(commands.Bot):
         if message.author == self.user:
             return
 
-        # Log message for debugging
-        if message.content.startswith('!'):
-            logger.info(f"Command received: {message.content} from {message.author}")
+        # Log commands for debugging (lazy %-formatting: nothing is built unless DEBUG is on)
+        if logger.isEnabledFor(logging.DEBUG) and message.content.startswith('!'):
+            logger.debug("Command received: %s from %s", message.content, message.author)
 
         # Process commands
         await self.process_commands(message)
@@ -87,15 +268,11 @@ class CryptoBot(commands.Bot):
         """Called when a new thread (ticket) is created"""
         try:
             # Check if this is a ticket (usually contains "ticket" in the name or has specific category)
-            if "ticket" in thread.name.lower() or thread.parent and "ticket" in thread.parent.name.lower():
+            if TICKET_NAME_RE.search(thread.name) or thread.parent and TICKET_NAME_RE.search(thread.parent.name):
                 logger.info(f"New ticket detected: {thread.name}")
 
-                # Wait a moment for the ticket to be fully created
-                await asyncio.sleep(1)
-
-                # Send help command in the ticket
-                await thread.send("/help")
-                logger.info(f"Auto-sent /help in ticket: {thread.name}")
+                # Send help command once the ticket is ready, without holding up the event
+                self.create_background_task(self.send_help_later(thread))
 
         except Exception as e:
             logger.error(f"Error handling ticket creation: {e}")
@@ -104,15 +281,11 @@ class CryptoBot(commands.Bot):
         """Called when a new channel is created"""
         try:
             # Check if this is a ticket channel
-            if "ticket" in channel.name.lower():
+            if TICKET_NAME_RE.search(channel.name):
                 logger.info(f"New ticket channel detected: {channel.name}")
 
-                # Wait a moment for the channel to be fully created
-                await asyncio.sleep(1)
-
-                # Send help command in the ticket
-                await channel.send("/help")
-                logger.info(f"Auto-sent /help in ticket channel: {channel.name}")
+                # Send help command once the channel is ready, without holding up the event
+                self.create_background_task(self.send_help_later(channel))
 
         except Exception as e:
             logger.error(f"Error handling ticket channel creation: {e}")
@@ -138,8 +311,7 @@ class CryptoBot(commands.Bot):
             # Check users.json - only check if file is valid JSON, don't check content
             try:
                 if os.path.exists(self.user_manager.users_file):
-                    with open(self.user_manager.users_file, 'r') as f:
-                        users_data = json.load(f)  # Just check if it's valid JSON
+                    users_data = read_json(self.user_manager.users_file)  # Just check if it's valid JSON
                     users_file_ok = True
                     logger.info(f"Main users.json file is valid JSON with {len(users_data)} entries, using it")
                 else:
@@ -150,8 +322,7 @@ class CryptoBot(commands.Bot):
             # Check prices.json - only check if file is valid JSON, don't check content
             try:
                 if os.path.exists(self.price_manager.prices_file):
-                    with open(self.price_manager.prices_file, 'r') as f:
-                        prices_data = json.load(f)  # Just check if it's valid JSON
+                    read_json(self.price_manager.prices_file)  # Just check if it's valid JSON
                     prices_file_ok = True
                     logger.info("Main prices.json file is valid JSON, using it")
                 else:
@@ -160,18 +331,19 @@ class CryptoBot(commands.Bot):
                 logger.warning(f"Main prices.json file is corrupted: {e}")
 
             # Only restore from backup if main files are missing or corrupted (not based on content)
+            latest_backups = {}
+            if not (users_file_ok and prices_file_ok):
+                latest_backups = self.find_latest_backups(data_dir)
+
             if not users_file_ok:
-                user_backups = [f for f in os.listdir(data_dir) if f.startswith('shutdown_backup_users_') and f.endswith('.json')]
-                if user_backups:
-                    latest_user_backup = max(user_backups, key=lambda x: os.path.getctime(os.path.join(data_dir, x)))
+                latest_user_backup = latest_backups.get('users')
+                if latest_user_backup:
                     user_backup_path = os.path.join(data_dir, latest_user_backup)
 
                     try:
-                        with open(user_backup_path, 'r') as f:
-                            backup_users = json.load(f)
+                        backup_users = read_json(user_backup_path)
 
-                        self.user_manager.users = backup_users
-                        self.user_manager.save_users()
+                        self.user_manager.set_users(backup_users)
                         logger.info(f"Restored {len(backup_users)} users from backup: {latest_user_backup}")
                     except Exception as e:
                         logger.error(f"Error reading user backup file: {e}")
@@ -180,17 +352,15 @@ class CryptoBot(commands.Bot):
                     logger.info("No user backup found, will use empty user data")
 
             if not prices_file_ok:
-                price_backups = [f for f in os.listdir(data_dir) if f.startswith('shutdown_backup_prices_') and f.endswith('.json')]
-                if price_backups:
-                    latest_price_backup = max(price_backups, key=lambda x: os.path.getctime(os.path.join(data_dir, x)))
+                latest_price_backup = latest_backups.get('prices')
+                if latest_price_backup:
                     price_backup_path = os.path.join(data_dir, latest_price_backup)
 
                     try:
-                        with open(price_backup_path, 'r') as f:
-                            backup_data = json.load(f)
+                        backup_data = read_json(price_backup_path)
 
                         self.price_manager.current_prices = backup_data.get('current_prices', {})
-                        self.price_manager.price_history = backup_data.get('price_history', {})
+                        self.price_manager.set_price_history(backup_data.get('price_history', {}))
 
                         # Restore last_update
                         if backup_data.get('last_update'):
@@ -211,21 +381,83 @@ class CryptoBot(commands.Bot):
             logger.error(f"Error during backup check/restore: {e}")
             logger.info("Continuing with existing data files")
 
+    def find_latest_backups(self, data_dir):
+        """Find the newest users and prices shutdown backups
+
+        The latest_backup_* links maintained by create_shutdown_backup are tried
+        first; the directory is only scanned for kinds without a valid link.
+        """
+        latest = {}
+        for kind in ('users', 'prices'):
+            try:
+                name = os.readlink(os.path.join(data_dir, f"latest_backup_{kind}"))
+            except OSError:
+                continue
+            if os.path.isfile(os.path.join(data_dir, name)):
+                latest[kind] = name
+        if len(latest) == 2:
+            return latest
+
+        linked = set(latest)
+        newest_ctime = {}
+        with os.scandir(data_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if not name.endswith('.json') or not name.startswith('shutdown_backup_'):
+                    continue
+                if name.startswith('shutdown_backup_users_'):
+                    kind = 'users'
+                elif name.startswith('shutdown_backup_prices_'):
+                    kind = 'prices'
+                else:
+                    continue
+                if kind in linked:
+                    continue
+                ctime = entry.stat().st_ctime
+                if ctime > newest_ctime.get(kind, float('-inf')):
+                    newest_ctime[kind] = ctime
+                    latest[kind] = name
+        return latest
+
+    def update_latest_backup_link(self, kind, backup_name):
+        """Atomically point data/latest_backup_<kind> at the newest backup file"""
+        data_dir = self.price_manager.config.DATA_DIR
+        link_path = os.path.join(data_dir, f"latest_backup_{kind}")
+        tmp_link_path = link_path + ".tmp"
+        try:
+            if os.path.lexists(tmp_link_path):
+                os.unlink(tmp_link_path)
+            os.symlink(backup_name, tmp_link_path)
+            os.replace(tmp_link_path, link_path)
+        except OSError as e:
+            # Symlinks may be unavailable (e.g. on Windows), restore falls back to a scan
+            logger.warning(f"Could not update latest {kind} backup link: {e}")
+
+    def save_all_data(self):
+        """Save user, price and admin data to disk"""
+        self.user_manager.save_users()
+        self.price_manager.save_prices()
+        self.admin_manager.save_admins()
+
+    def flush_all_data(self):
+        """Save user, price and admin data that changed since the last save"""
+        self.user_manager.flush()
+        self.price_manager.flush()
+        self.admin_manager.flush()
+
     async def auto_save_task(self):
         """Periodic auto-save task to prevent data loss"""
         while True:
             try:
                 await asyncio.sleep(300)  # Auto-save every 5 minutes
-                logger.info("Performing periodic auto-save...")
+                managers = (self.user_manager, self.price_manager, self.admin_manager)
+                if not any(manager.dirty for manager in managers):
+                    continue
 
-                # Force save user data
-                self.user_manager.save_users()
-
-                # Force save price data
-                self.price_manager.save_prices()
+                logger.info("Performing periodic auto-save...")
 
-                # Force save admin data
-                self.admin_manager.save_admins()
+                # Save pending users, prices and admins changes in one worker thread, off the event loop
+                await asyncio.to_thread(self.flush_all_data)
 
                 logger.info("Periodic auto-save completed")
 
@@ -238,25 +470,26 @@ class CryptoBot(commands.Bot):
         try:
             # Force save all data before backup
             logger.info("Forcing save of all data before shutdown...")
-            self.user_manager.save_users()
-            self.price_manager.save_prices()
-            self.admin_manager.save_admins()
+            self.save_all_data()
 
             # Backup users with shutdown prefix
             user_backup = self.user_manager.backup_users("shutdown_backup")
+            if user_backup:
+                self.update_latest_backup_link('users', user_backup)
             logger.info(f"Shutdown backup - Users: {user_backup}")
 
             # Backup prices with shutdown prefix
             price_backup = f"shutdown_backup_prices_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
             price_backup_path = os.path.join(self.price_manager.config.DATA_DIR, price_backup)
 
-            with open(price_backup_path, 'w') as f:
-                data = {
-                    'current_prices': self.price_manager.current_prices,
-                    'price_history': self.price_manager.price_history,
-                    'last_update': self.price_manager.last_update.isoformat() if self.price_manager.last_update else None
-                }
-                json.dump(data, f, indent=2)
+            data = {
+                'current_prices': self.price_manager.current_prices,
+                'price_history': self.price_manager.price_history_data(),
+                'last_update': self.price_manager.last_update.isoformat() if self.price_manager.last_update else None
+            }
+            # Encode on the loop (consistent snapshot), write the file off the loop
+            await asyncio.to_thread(atomic_write, price_backup_path, dumps(data))
+            self.update_latest_backup_link('prices', price_backup)
 
             logger.info(f"Shutdown backup - Prices: {price_backup}")
             logger.info("Automatic shutdown backup completed successfully")
@@ -273,22 +506,20 @@ class CryptoBot(commands.Bot):
         if isinstance(error, commands.CommandNotFound):
             # List available commands for debugging
             available_commands = [cmd.name for cmd in self.commands]
-            logger.info(f"Available commands: {available_commands}")
+            logger.debug("Available commands: %s", available_commands)
             await ctx.send(f"❌ Commande introuvable. Commandes disponibles : {', '.join(available_commands)}")
         elif isinstance(error, commands.MissingPermissions):
             await ctx.send("❌ Vous n'avez pas les permissions pour utiliser cette commande.")
         elif isinstance(error, commands.CheckFailure):
             # Check if there are any admins configured
-            admin_list = bot.admin_manager.get_admins()
-            if len(admin_list) == 0:
+            if bot.admin_manager.admin_count == 0:
                 await ctx.send("❌ Vous n'avez pas les permissions administrateur pour cette commande. Utilisez `/addadmin @vous` pour devenir le premier admin.")
             else:
                 await ctx.send("❌ Vous n'avez pas les permissions administrateur pour cette commande. Contactez un administrateur existant.")
         else:
-            logger.error(f"Command error in {ctx.command}: {error}")
-            logger.error(f"Error details: {type(error).__name__}: {str(error)}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            # The error is not being handled here, so pass it explicitly; the
+            # traceback is only formatted if a handler actually emits the record
+            logger.error(f"Command error in {ctx.command}: {error}", exc_info=error)
             await ctx.send(f"❌ Une erreur est survenue lors du traitement de votre commande: {type(error).__name__}")
 
     async def on_app_command_error(self, interaction: discord.Interaction, error: Exception):
@@ -311,41 +542,54 @@ class CryptoBot(commands.Bot):
         except Exception as e:
             logger.error(f"Failed to send error message: {e}")
 
-    async def log_transaction(self, user, action, currency=None, amount=None, price=None):
-        """Log transactions to the admin log channel"""
-        log_channel_id = self.admin_manager.get_log_channel()
-        if not log_channel_id:
+    def log_transaction(self, user, action, currency=None, amount=None, price=None):
+        """Queue a transaction for the admin log channel
+
+        The embed is posted by transaction_log_task, so commands never wait on it.
+        """
+        if self._log_queue is None or not self.admin_manager.get_log_channel():
             return
 
-        try:
-            channel = self.get_channel(log_channel_id)
-            if not channel:
-                return
+        embed = discord.Embed(
+            title="🔔 Transaction Log",
+            color=0x00ff00 if action == "buy" else 0xff0000 if action == "sell" else 0x0099ff,
+            timestamp=datetime.now()
+        )
 
-            embed = discord.Embed(
-                title="🔔 Transaction Log",
-                color=0x00ff00 if action == "buy" else 0xff0000 if action == "sell" else 0x0099ff,
-                timestamp=datetime.now()
-            )
+        embed.add_field(name="Utilisateur", value=f"{user.name} (ID: {user.id})", inline=False)
+        embed.add_field(name="Action", value=action.title(), inline=True)
 
-            embed.add_field(name="Utilisateur", value=f"{user.name} (ID: {user.id})", inline=False)
-            embed.add_field(name="Action", value=action.title(), inline=True)
+        if currency:
+            embed.add_field(name="Cryptomonnaie", value=currency.title(), inline=True)
+        if amount:
+            embed.add_field(name="Montant", value=f"{amount}", inline=True)
+        if price:
+            embed.add_field(name="Prix", value=f"€{price:.2f}", inline=True)
 
-            if currency:
-                embed.add_field(name="Cryptomonnaie", value=currency.title(), inline=True)
-            if amount:
-                embed.add_field(name="Montant", value=f"{amount}", inline=True)
-            if price:
-                embed.add_field(name="Prix", value=f"€{price:.2f}", inline=True)
+        try:
+            self._log_queue.put_nowait(embed)
+        except asyncio.QueueFull:
+            logger.warning(f"Transaction log queue full, dropping {action} log for {user.id}")
 
-            await channel.send(embed=embed)
-        except Exception as e:
-            logger.error(f"Error logging transaction: {e}")
+    async def transaction_log_task(self):
+        """Post queued transaction logs, several embeds per message when they pile up"""
+        while True:
+            embeds = [await self._log_queue.get()]
+            # Whatever was queued meanwhile (e.g. while the previous send was in flight) goes in the same message
+            while len(embeds) < LOG_EMBEDS_PER_MESSAGE and not self._log_queue.empty():
+                embeds.append(self._log_queue.get_nowait())
+
+            try:
+                channel = self.get_channel(self.admin_manager.get_log_channel())
+                if channel:
+                    await channel.send(embeds=embeds)
+            except Exception as e:
+                logger.error(f"Error logging transaction: {e}")
 
     async def start_web_server(self):
         """Start the web server"""
         try:
-            app = web.Application()
+            app = web.Application(middlewares=[json_errors])
             
             # Setup CORS
             cors = aiohttp_cors.setup(app, defaults={
@@ -371,230 +615,168 @@ class CryptoBot(commands.Bot):
 
             # Port dynamique pour Render (utilise PORT env var ou 5000 par défaut)
             port = int(os.getenv('PORT', 5000))
-            
+
+            # Essayer d'autres ports si le port principal est occupé
+            candidates = [port, port + 1, port + 2, 8000, 8080]
+
             # Start server
-            runner = web.AppRunner(app)
+            # Per-request access logs are only kept when debugging
+            runner = web.AppRunner(
+                app,
+                access_log=access_logger if logger.isEnabledFor(logging.DEBUG) else None
+            )
             await runner.setup()
-            site = web.TCPSite(runner, '0.0.0.0', port)
-            await site.start()
-            
-            logger.info(f"Web server started on http://0.0.0.0:{port}")
-            
-        except OSError as e:
-            if "Address already in use" in str(e):
-                logger.warning(f"Port {port} already in use, trying alternative ports...")
-                # Essayer d'autres ports si le port principal est occupé
-                for alt_port in [port + 1, port + 2, 8000, 8080]:
-                    try:
-                        site = web.TCPSite(runner, '0.0.0.0', alt_port)
-                        await site.start()
-                        logger.info(f"Web server started on alternative port http://0.0.0.0:{alt_port}")
-                        break
-                    except OSError:
-                        continue
-                else:
-                    logger.error("Could not find available port for web server")
+
+            for bind_port in candidates:
+                try:
+                    site = web.TCPSite(runner, '0.0.0.0', bind_port)
+                    await site.start()
+                except OSError as e:
+                    logger.warning(f"Port {bind_port} unavailable ({e}), trying next port...")
+                    continue
+                if bind_port != port:
+                    logger.warning(f"Port {port} already in use, using alternative port {bind_port}")
+                logger.info(f"Web server started on http://0.0.0.0:{bind_port}")
+                break
             else:
-                logger.error(f"OS error starting web server: {e}")
+                logger.error("Could not find available port for web server")
+                await runner.cleanup()
+
+        except OSError as e:
+            logger.error(f"OS error starting web server: {e}")
         except Exception as e:
             logger.error(f"Error starting web server: {e}")
 
     async def handle_health(self, request):
         """Handle health check endpoint for Render"""
-        return web.json_response({
-            "status": "healthy",
-            "timestamp": datetime.now().isoformat(),
-            "bot_status": "online" if self.is_ready() else "starting"
-        })
+        cache_key = (iso_now(), self.is_ready())
+        if self._health_cache[0] != cache_key:
+            timestamp, ready = cache_key
+            self._health_cache = (cache_key, dumps({
+                "status": "healthy",
+                "timestamp": timestamp,
+                "bot_status": "online" if ready else "starting"
+            }))
+        return web.Response(body=self._health_cache[1], content_type='application/json')
 
     async def handle_root(self, request):
         """Handle root endpoint"""
-        html = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>CryptoBot Status</title>
-            <meta charset="UTF-8">
-            <style>
-                body { font-family: Arial, sans-serif; margin: 40px; background: #f5f5f5; }
-                .container { max-width: 800px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
-                h1 { color: #333; text-align: center; }
-                .status { padding: 20px; border-radius: 5px; margin: 20px 0; }
-                .online { background: #d4edda; border-left: 5px solid #28a745; }
-                .info { background: #d1ecf1; border-left: 5px solid #17a2b8; }
-                .endpoint { background: #f8f9fa; padding: 15px; margin: 10px 0; border-radius: 5px; border-left: 3px solid #007bff; }
-                code { background: #e9ecef; padding: 2px 5px; border-radius: 3px; }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>🤖 CryptoBot Status</h1>
-                
-                <div class="status online">
-                    <h3>✅ Bot Status: Online</h3>
-                    <p>Le bot Discord fonctionne correctement et est prêt à recevoir des commandes.</p>
-                </div>
-                
-                <div class="status info">
-                    <h3>📊 Informations</h3>
-                    <p><strong>Serveurs connectés:</strong> """ + str(len(self.guilds)) + """</p>
-                    <p><strong>Latence:</strong> """ + f"{self.latency * 1000:.2f}ms" + """</p>
-                    <p><strong>Utilisateur:</strong> """ + str(self.user) + """</p>
-                </div>
-                
-                <div class="status info">
-                    <h3>🔗 API Endpoints</h3>
-                    <div class="endpoint">
-                        <strong>GET /status</strong><br>
-                        <code>Statut détaillé du bot en JSON</code>
-                    </div>
-                    <div class="endpoint">
-                        <strong>GET /prices</strong><br>
-                        <code>Prix actuels des cryptomonnaies en JSON</code>
-                    </div>
-                    <div class="endpoint">
-                        <strong>GET /stats</strong><br>
-                        <code>Statistiques générales du bot en JSON</code>
-                    </div>
-                </div>
-                
-                <div class="status info">
-                    <h3>💰 Commandes Discord</h3>
-                    <p>Utilisez <code>/help</code> dans Discord pour voir toutes les commandes disponibles.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        return web.Response(text=html, content_type='text/html')
+        now = monotonic()
+        if now - self._root_rendered_at >= ROOT_PAGE_CACHE_SECONDS:
+            self._root_html = ROOT_PAGE_TEMPLATE.substitute(
+                guilds=len(self.guilds),
+                latency=f"{self.latency * 1000:.2f}ms",
+                user=self.user
+            ).encode()
+            self._root_rendered_at = now
+        return web.Response(body=self._root_html, content_type='text/html', charset='utf-8')
 
     async def handle_status(self, request):
         """Handle status API endpoint"""
-        try:
-            status_data = {
-                "status": "online",
-                "bot_user": str(self.user),
-                "guild_count": len(self.guilds),
-                "latency_ms": round(self.latency * 1000, 2),
-                "uptime": str(datetime.now()),
-                "last_price_update": self.price_manager.get_last_update().isoformat() if self.price_manager.get_last_update() else None,
-                "admin_count": len(self.admin_manager.get_admins()),
-                "user_count": len(self.user_manager.users),
-                "commands_registered": len(self.commands)
-            }
-            return web.json_response(status_data)
-        except Exception as e:
-            logger.error(f"Error in status endpoint: {e}")
-            return web.json_response({"error": "Internal server error"}, status=500)
+        last_update = self.price_manager.get_last_update()
+        status_data = {
+            "status": "online",
+            "bot_user": str(self.user),
+            "guild_count": len(self.guilds),
+            "latency_ms": round(self.latency * 1000, 2),
+            "uptime": str(datetime.now()),
+            "last_price_update": last_update.isoformat() if last_update else None,
+            "admin_count": self.admin_manager.admin_count,
+            "user_count": self.user_manager.user_count,
+            "commands_registered": len(self.commands)
+        }
+        return json_response(status_data)
 
     async def handle_prices_api(self, request):
         """Handle prices API endpoint"""
-        try:
-            prices = self.price_manager.get_current_prices()
-            price_data = {
-                "prices": prices,
-                "last_update": self.price_manager.get_last_update().isoformat() if self.price_manager.get_last_update() else None,
-                "timestamp": datetime.now().isoformat()
-            }
-            return web.json_response(price_data)
-        except Exception as e:
-            logger.error(f"Error in prices endpoint: {e}")
-            return web.json_response({"error": "Internal server error"}, status=500)
+        prices = self.price_manager.get_current_prices()
+        last_update = self.price_manager.get_last_update()
+        price_data = {
+            "prices": prices,
+            "last_update": last_update.isoformat() if last_update else None,
+            "timestamp": iso_now()
+        }
+        return json_response(price_data)
 
     async def handle_stats(self, request):
         """Handle stats API endpoint"""
-        try:
-            total_balance = 0
-            total_buxcoin = 0
-            total_bitcoin = 0
-            
-            for user_data in self.user_manager.users.values():
-                total_balance += user_data.get('balance', 0)
-                total_buxcoin += user_data.get('buxcoin', 0)
-                total_bitcoin += user_data.get('bitcoin', 0)
-            
-            prices = self.price_manager.get_current_prices()
+        totals = self.user_manager.get_totals()
+        total_balance = totals['balance']
+        total_buxcoin = totals['buxcoin']
+        total_bitcoin = totals['bitcoin']
+
+        prices = self.price_manager.get_current_prices()
             
-            stats_data = {
-                "total_users": len(self.user_manager.users),
-                "total_balance_eur": round(total_balance, 2),
-                "total_buxcoin": round(total_buxcoin, 4),
-                "total_bitcoin": round(total_bitcoin, 4),
-                "total_crypto_value_eur": round((total_buxcoin * prices['buxcoin']) + (total_bitcoin * prices['bitcoin']), 2),
-                "current_prices": prices,
-                "admin_count": len(self.admin_manager.get_admins()),
-                "timestamp": datetime.now().isoformat()
-            }
-            return web.json_response(stats_data)
-        except Exception as e:
-            logger.error(f"Error in stats endpoint: {e}")
-            return web.json_response({"error": "Internal server error"}, status=500)
+        stats_data = {
+            "total_users": self.user_manager.user_count,
+            "total_balance_eur": round(total_balance, 2),
+            "total_buxcoin": round(total_buxcoin, 4),
+            "total_bitcoin": round(total_bitcoin, 4),
+            "total_crypto_value_eur": round((total_buxcoin * prices['buxcoin']) + (total_bitcoin * prices['bitcoin']), 2),
+            "current_prices": prices,
+            "admin_count": self.admin_manager.admin_count,
+            "timestamp": iso_now()
+        }
+        return json_response(stats_data)
 
     async def handle_ping(self, request):
         """Handle ping endpoint"""
-        return web.Response(text='Pong!', status=200)
+        return web.Response(body=PONG_BODY, content_type='text/plain', charset='utf-8')
 
 # Create bot instance before defining commands
 bot = CryptoBot()
 
-class PricesView(discord.ui.View):
-    def __init__(self, bot):
-        super().__init__(timeout=300)  # 5 minutes timeout
-        self.bot = bot
-
-    @discord.ui.button(label="🔄 Actualiser", style=discord.ButtonStyle.primary)
-    async def refresh_prices(self, interaction: discord.Interaction, button: discord.ui.Button):
-        try:
-            prices = self.bot.price_manager.get_current_prices()
-
-            embed = discord.Embed(
-                title="🪙 Prix Actuels des Cryptomonnaies",
-                color=0x00ff00,
-                timestamp=interaction.created_at
-            )
-
-            embed.add_field(
-                name="💰 Buxcoin",
-                value=f"€{prices['buxcoin']:.2f}",
-                inline=True
-            )
-
-            embed.add_field(
-                name="₿ Bitcoin",
-                value=f"€{prices['bitcoin']:.2f}",
-                inline=True
-            )
-
-            # Add last update info
-            last_update = self.bot.price_manager.get_last_update()
-            if last_update:
-                embed.add_field(
-                    name="📅 Dernière Mise à Jour",
-                    value=last_update.strftime("%Y-%m-%d %H:%M:%S"),
-                    inline=False
-                )
-
-            embed.set_footer(text="Les prix se mettent à jour toutes les 3 minutes")
+# Currency options offered by slash commands; Discord only accepts these values
+CURRENCY_CHOICES = [app_commands.Choice(name=currency.title(), value=currency) for currency in CONFIG.CURRENCIES]
 
-            await interaction.response.edit_message(embed=embed, view=self)
-
-        except Exception as e:
-            logger.error(f"Error refreshing prices: {e}")
-            await interaction.response.send_message("❌ Erreur lors de l'actualisation des prix.", ephemeral=True)
-
-@bot.tree.command(name='prices', description='Afficher les prix actuels des cryptomonnaies')
-async def show_prices(interaction: discord.Interaction):
-    """Show current prices for both currencies"""
-    try:
-        await interaction.response.defer()
-        logger.info(f"Command /prices called by {interaction.user}")
-        prices = bot.price_manager.get_current_prices()
-        logger.info(f"Prices retrieved: {prices}")
+NOT_ADMIN_MESSAGE = "❌ Vous n'avez pas les permissions administrateur pour cette commande."
 
+def admin_guard(func, allowed):
+    """Wrap a command so it only runs when allowed(author_id) is true"""
+    @functools.wraps(func)
+    async def wrapper(target, *args, **kwargs):
+        if isinstance(target, discord.Interaction):
+            if not allowed(target.user.id):
+                await target.response.send_message(NOT_ADMIN_MESSAGE, ephemeral=True)
+                return
+        elif not allowed(target.author.id):
+            await target.send(NOT_ADMIN_MESSAGE)
+            return
+        return await func(target, *args, **kwargs)
+    return wrapper
+
+def require_admin(func):
+    """Only run a command for admins, others get the usual refusal message
+
+    Works for slash (Interaction) and prefix (Context) commands; place it
+    below the @bot.tree.command / @bot.command decorator.
+    """
+    return admin_guard(func, bot.admin_manager.is_admin)
+
+def is_admin_or_first(user_id: int) -> bool:
+    """Admins, or anyone while no admin exists yet (first admin bootstrap)"""
+    return bot.admin_manager.is_admin(user_id) or bot.admin_manager.admin_count == 0
+
+def require_admin_or_first(func):
+    """Like require_admin, but lets anyone through while there are no admins"""
+    return admin_guard(func, is_admin_or_first)
+
+def build_prices_embed(bot, timestamp):
+    """Build the current prices embed
+
+    The embed fields only change when prices do, so they are cached as a dict
+    on the bot and reused until the next price update.
+    """
+    price_manager = bot.price_manager
+    prices = price_manager.get_current_prices()
+    last_update = price_manager.get_last_update()
+    cache_key = (last_update, tuple(prices.items()))
+
+    cached_key, cached_data = bot._prices_embed_cache
+    if cached_key != cache_key:
         embed = discord.Embed(
             title="🪙 Prix Actuels des Cryptomonnaies",
-            color=0x00ff00,
-            timestamp=interaction.created_at
+            color=0x00ff00
         )
 
         embed.add_field(
@@ -610,7 +792,6 @@ async def show_prices(interaction: discord.Interaction):
         )
 
         # Add last update info
-        last_update = bot.price_manager.get_last_update()
         if last_update:
             embed.add_field(
                 name="📅 Dernière Mise à Jour",
@@ -620,11 +801,147 @@ async def show_prices(interaction: discord.Interaction):
 
         embed.set_footer(text="Les prix se mettent à jour toutes les 3 minutes")
 
+        cached_data = embed.to_dict()
+        bot._prices_embed_cache = (cache_key, cached_data)
+
+    return embed_from_dict(cached_data, timestamp)
+
+def embed_from_dict(data, timestamp):
+    """Create an embed from a cached to_dict() payload, stamped with the given time"""
+    embed = discord.Embed.from_dict(data)
+    embed.timestamp = timestamp
+    return embed
+
+def build_wallet_embed(wallet, prices, timestamp):
+    """Build the embed showing a user their own wallet"""
+    buxcoin_price, bitcoin_price = prices['buxcoin'], prices['bitcoin']
+
+    # Calculate crypto values
+    buxcoin_value = wallet['buxcoin'] * buxcoin_price
+    bitcoin_value = wallet['bitcoin'] * bitcoin_price
+    total_crypto_value = buxcoin_value + bitcoin_value
+
+    embed = discord.Embed(
+        title="💰 Votre Portefeuille",
+        color=0xffd700,
+        timestamp=timestamp
+    )
+
+    embed.add_field(
+        name="💵 Solde",
+        value=f"€{wallet['balance']:.2f}",
+        inline=True
+    )
+
+    embed.add_field(
+        name="💰 Buxcoin",
+        value=f"{wallet['buxcoin']:.4f} BUX\n€{buxcoin_price:.2f}/unité\n**Total: €{buxcoin_value:.2f}**",
+        inline=True
+    )
+
+    embed.add_field(
+        name="🪙 Bitcoin",
+        value=f"{wallet['bitcoin']:.4f} BTC\n€{bitcoin_price:.2f}/unité\n**Total: €{bitcoin_value:.2f}**",
+        inline=True
+    )
+
+    embed.add_field(
+        name="💎 Valeur Totale Crypto",
+        value=f"**€{total_crypto_value:.2f}**",
+        inline=False
+    )
+
+    embed.set_footer(text="Utilisez /buy et /sell pour acheter ou vendre des cryptomonnaies")
+    return embed
+
+def build_user_wallet_embed(user, wallet, prices, timestamp, requested_by):
+    """Build the embed showing a user's wallet to an admin (/adminaction viewuser, !viewuser)"""
+    # Calculate crypto values
+    buxcoin_value = wallet['buxcoin'] * prices['buxcoin']
+    bitcoin_value = wallet['bitcoin'] * prices['bitcoin']
+    total_crypto_value = buxcoin_value + bitcoin_value
+
+    embed = discord.Embed(
+        title=f"👤 Portefeuille de {user.display_name}",
+        color=0x00bfff,
+        timestamp=timestamp
+    )
+
+    embed.add_field(
+        name="💵 Solde",
+        value=f"€{wallet['balance']:.2f}",
+        inline=True
+    )
+
+    embed.add_field(
+        name="💰 Buxcoin",
+        value=f"{wallet['buxcoin']:.4f} BUX\n€{buxcoin_value:.2f}",
+        inline=True
+    )
+
+    embed.add_field(
+        name="🪙 Bitcoin",
+        value=f"{wallet['bitcoin']:.4f} BTC\n€{bitcoin_value:.2f}",
+        inline=True
+    )
+
+    embed.add_field(
+        name="💎 Valeur Totale Crypto",
+        value=f"€{total_crypto_value:.2f}",
+        inline=False
+    )
+
+    embed.add_field(
+        name="📊 Valeur Totale",
+        value=f"€{wallet['balance'] + total_crypto_value:.2f}",
+        inline=False
+    )
+
+    # Show recent transactions
+    if wallet['transactions']:
+        recent_transactions = wallet['transactions'][-3:]  # Last 3 transactions
+        trans_text = "".join(
+            f"• {trans['type'].title()} {trans['amount']:.4f} {trans.get('currency', '')}\n"
+            for trans in recent_transactions
+        )
+
+        embed.add_field(
+            name="📝 Dernières Transactions",
+            value=trans_text or "Aucune transaction",
+            inline=False
+        )
+
+    embed.set_footer(text=f"Demandé par {requested_by.display_name}")
+    return embed
+
+class PricesView(discord.ui.View):
+    def __init__(self, bot):
+        super().__init__(timeout=300)  # 5 minutes timeout
+        self.bot = bot
+
+    @discord.ui.button(label="🔄 Actualiser", style=discord.ButtonStyle.primary)
+    async def refresh_prices(self, interaction: discord.Interaction, button: discord.ui.Button):
+        try:
+            embed = build_prices_embed(self.bot, interaction.created_at)
+            await interaction.response.edit_message(embed=embed, view=self)
+
+        except Exception as e:
+            logger.error(f"Error refreshing prices: {e}")
+            await interaction.response.send_message("❌ Erreur lors de l'actualisation des prix.", ephemeral=True)
+
+@bot.tree.command(name='prices', description='Afficher les prix actuels des cryptomonnaies')
+async def show_prices(interaction: discord.Interaction):
+    """Show current prices for both currencies"""
+    try:
+        logger.info(f"Command /prices called by {interaction.user}")
+
+        embed = build_prices_embed(bot, interaction.created_at)
+
         view = PricesView(bot)
-        await interaction.followup.send(embed=embed, view=view)
+        await interaction.response.send_message(embed=embed, view=view)
 
         # Log the command usage
-        await bot.log_transaction(interaction.user, "prices_check")
+        bot.log_transaction(interaction.user, "prices_check")
 
     except Exception as e:
         logger.error(f"Error showing prices: {e}")
@@ -646,43 +963,7 @@ class WalletView(discord.ui.View):
             wallet = self.bot.user_manager.get_user_wallet(self.user_id)
             prices = self.bot.price_manager.get_current_prices()
 
-            # Calculate crypto values
-            buxcoin_value = wallet['buxcoin'] * prices['buxcoin']
-            bitcoin_value = wallet['bitcoin'] * prices['bitcoin']
-            total_crypto_value = buxcoin_value + bitcoin_value
-
-            embed = discord.Embed(
-                title="💰 Votre Portefeuille",
-                color=0xffd700,
-                timestamp=interaction.created_at
-            )
-
-            embed.add_field(
-                name="💵 Solde",
-                value=f"€{wallet['balance']:.2f}",
-                inline=True
-            )
-
-            embed.add_field(
-                name="💰 Buxcoin",
-                value=f"{wallet['buxcoin']:.4f} BUX\n€{prices['buxcoin']:.2f}/unité\n**Total: €{buxcoin_value:.2f}**",
-                inline=True
-            )
-
-            embed.add_field(
-                name="🪙 Bitcoin",
-                value=f"{wallet['bitcoin']:.4f} BTC\n€{prices['bitcoin']:.2f}/unité\n**Total: €{bitcoin_value:.2f}**",
-                inline=True
-            )
-
-            embed.add_field(
-                name="💎 Valeur Totale Crypto",
-                value=f"**€{total_crypto_value:.2f}**",
-                inline=False
-            )
-
-            embed.set_footer(text="Utilisez /buy et /sell pour acheter ou vendre des cryptomonnaies")
-
+            embed = build_wallet_embed(wallet, prices, interaction.created_at)
             await interaction.response.edit_message(embed=embed, view=self)
 
         except Exception as e:
@@ -693,54 +974,18 @@ class WalletView(discord.ui.View):
 async def show_wallet(interaction: discord.Interaction):
     """Show user's wallet"""
     try:
-        await interaction.response.defer()
         logger.info(f"Command /wallet called by {interaction.user}")
-        wallet = bot.user_manager.get_user_wallet(str(interaction.user.id))
-        logger.info(f"Wallet retrieved: {wallet}")
+        wallet = bot.user_manager.get_user_wallet(interaction.user.id)
+        logger.debug("Wallet retrieved: %s", wallet)
         prices = bot.price_manager.get_current_prices()
 
-        # Calculate crypto values
-        buxcoin_value = wallet['buxcoin'] * prices['buxcoin']
-        bitcoin_value = wallet['bitcoin'] * prices['bitcoin']
-        total_crypto_value = buxcoin_value + bitcoin_value
-
-        embed = discord.Embed(
-            title="💰 Votre Portefeuille",
-            color=0xffd700,
-            timestamp=interaction.created_at
-        )
-
-        embed.add_field(
-            name="💵 Solde",
-            value=f"€{wallet['balance']:.2f}",
-            inline=True
-        )
-
-        embed.add_field(
-            name="💰 Buxcoin",
-            value=f"{wallet['buxcoin']:.4f} BUX\n€{prices['buxcoin']:.2f}/unité\n**Total: €{buxcoin_value:.2f}**",
-            inline=True
-        )
-
-        embed.add_field(
-            name="🪙 Bitcoin",
-            value=f"{wallet['bitcoin']:.4f} BTC\n€{prices['bitcoin']:.2f}/unité\n**Total: €{bitcoin_value:.2f}**",
-            inline=True
-        )
-
-        embed.add_field(
-            name="💎 Valeur Totale Crypto",
-            value=f"**€{total_crypto_value:.2f}**",
-            inline=False
-        )
-
-        embed.set_footer(text="Utilisez /buy et /sell pour acheter ou vendre des cryptomonnaies")
+        embed = build_wallet_embed(wallet, prices, interaction.created_at)
 
         view = WalletView(bot, interaction.user.id)
-        await interaction.followup.send(embed=embed, view=view)
+        await interaction.response.send_message(embed=embed, view=view)
 
         # Log the command usage
-        await bot.log_transaction(interaction.user, "wallet_check")
+        bot.log_transaction(interaction.user, "wallet_check")
 
     except Exception as e:
         logger.error(f"Error showing wallet: {e}")
@@ -748,51 +993,54 @@ async def show_wallet(interaction: discord.Interaction):
 
 # All commands are now slash commands
 
+def build_help_embed_data():
+    """Build the /help embed (static, so built once at import)"""
+    embed = discord.Embed(
+        title="🤖 Aide - Commandes Disponibles",
+        description="Voici toutes les commandes que vous pouvez utiliser avec ce bot crypto",
+        color=0x00bfff
+    )
+
+    # Trading commands
+    embed.add_field(
+        name="💰 Trading",
+        value="• `/prices` - Voir les prix actuels des cryptomonnaies\n" +
+              "• `/wallet` - Afficher votre portefeuille\n" +
+              "• `/buy <crypto> <montant>` - Acheter des cryptomonnaies\n" +
+              "• `/sell <crypto> <montant>` - Vendre des cryptomonnaies",
+        inline=False
+    )
+
+    # Info commands
+    embed.add_field(
+        name="ℹ️ Informations",
+        value="• `/help` - Afficher cette aide\n" +
+              "• `/listadmins` - Voir la liste des administrateurs\n" +
+              "• `/pricehistory <crypto> [limite]` - Historique des prix",
+        inline=False
+    )
+
+    # Admin commands removed from help display 
+
+    # Usage examples
+    embed.add_field(
+        name="💡 Exemples d'Usage",
+        value="• `/buy buxcoin 10` - Acheter 10 BuxCoin\n" +
+              "• `/sell bitcoin 5` - Vendre 5 Bitcoin\n" +
+              "• `/pricehistory bitcoin 15` - Voir les 15 derniers prix Bitcoin",
+        inline=False
+    )
+
+    embed.set_footer(text="Les prix se mettent à jour automatiquement toutes les heures")
+    return embed.to_dict()
+
+HELP_EMBED_DATA = build_help_embed_data()
+
 @bot.tree.command(name='help', description='Afficher la liste de toutes les commandes disponibles')
 async def show_help(interaction: discord.Interaction):
     """Show all available commands"""
     try:
-        embed = discord.Embed(
-            title="🤖 Aide - Commandes Disponibles",
-            description="Voici toutes les commandes que vous pouvez utiliser avec ce bot crypto",
-            color=0x00bfff,
-            timestamp=interaction.created_at
-        )
-
-        # Trading commands
-        embed.add_field(
-            name="💰 Trading",
-            value="• `/prices` - Voir les prix actuels des cryptomonnaies\n" +
-                  "• `/wallet` - Afficher votre portefeuille\n" +
-                  "• `/buy <crypto> <montant>` - Acheter des cryptomonnaies\n" +
-                  "• `/sell <crypto> <montant>` - Vendre des cryptomonnaies",
-            inline=False
-        )
-
-        # Info commands
-        embed.add_field(
-            name="ℹ️ Informations",
-            value="• `/help` - Afficher cette aide\n" +
-                  "• `/listadmins` - Voir la liste des administrateurs\n" +
-                  "• `/pricehistory <crypto> [limite]` - Historique des prix",
-            inline=False
-        )
-
-        # Admin commands removed from help display 
-
-
-        # Usage examples
-        embed.add_field(
-            name="💡 Exemples d'Usage",
-            value="• `/buy buxcoin 10` - Acheter 10 BuxCoin\n" +
-                  "• `/sell bitcoin 5` - Vendre 5 Bitcoin\n" +
-                  "• `/pricehistory bitcoin 15` - Voir les 15 derniers prix Bitcoin",
-            inline=False
-        )
-
-
-
-        embed.set_footer(text="Les prix se mettent à jour automatiquement toutes les heures")
+        embed = embed_from_dict(HELP_EMBED_DATA, interaction.created_at)
 
         await interaction.response.send_message(embed=embed)
 
@@ -815,12 +1063,13 @@ async def list_admins(interaction: discord.Interaction):
         if not admin_list:
             embed.description = "Aucun administrateur configuré pour le moment."
         else:
+            users = await bot.resolve_users(admin_list)
             admin_mentions = []
             for admin_id in admin_list:
-                try:
-                    user = await bot.fetch_user(admin_id)
+                user = users[admin_id]
+                if user is not None:
                     admin_mentions.append(f"• {user.mention} (ID: {admin_id})")
-                except:
+                else:
                     admin_mentions.append(f"• Utilisateur inconnu (ID: {admin_id})")
 
             embed.add_field(
@@ -838,17 +1087,27 @@ async def list_admins(interaction: discord.Interaction):
         await interaction.response.send_message("❌ Erreur lors de la récupération de la liste des administrateurs.", ephemeral=True)
 
 
-@bot.tree.command(name='buy', description='Acheter des cryptomonnaies')
-async def buy_crypto(interaction: discord.Interaction, crypto: str, montant: float):
-    """Buy cryptocurrency"""
+# Per side of a trade: (UserManager method, embed color, embed title, total field label,
+# message when the user cannot afford it, message on unexpected errors, log label)
+TRADE_SIDES = {
+    'buy': (
+        bot.user_manager.buy_currency, 0x00ff00, "✅ Achat Réussi", "Coût Total",
+        "❌ Solde insuffisant pour cet achat.", "❌ Erreur lors de l'achat.", "buy command"
+    ),
+    'sell': (
+        bot.user_manager.sell_currency, 0xff0000, "✅ Vente Réussie", "Valeur Totale",
+        "❌ Vous n'avez pas assez de cette cryptomonnaie.", "❌ Erreur lors de la vente.", "sell command"
+    ),
+}
+
+async def run_trade(interaction: discord.Interaction, side: str, crypto: str, montant: float):
+    """Validate and execute a /buy or /sell, then answer with the result embed
+
+    crypto comes from CURRENCY_CHOICES, so Discord has already validated it.
+    """
+    trade, color, title, total_label, refused_message, error_message, log_label = TRADE_SIDES[side]
     try:
-        crypto = crypto.lower()
-
-        if crypto not in ['buxcoin', 'bitcoin']:
-            await interaction.response.send_message("❌ Cryptomonnaie invalide. Utilisez 'buxcoin' ou 'bitcoin'.", ephemeral=True)
-            return
-
-        if montant <= 0:
+        if not math.isfinite(montant) or montant <= 0:
             await interaction.response.send_message("❌ Le montant doit être positif.", ephemeral=True)
             return
 
@@ -857,92 +1116,53 @@ async def buy_crypto(interaction: discord.Interaction, crypto: str, montant: flo
             return
 
         price = bot.price_manager.get_price(crypto)
-        total_cost = montant * price
-
-        success = bot.user_manager.buy_currency(str(interaction.user.id), crypto, montant, price)
+        total = montant * price
 
-        if success:
+        if trade(interaction.user.id, crypto, montant, price):
             embed = discord.Embed(
-                title="✅ Achat Réussi",
-                color=0x00ff00,
+                title=title,
+                color=color,
                 timestamp=interaction.created_at
             )
             embed.add_field(name="Cryptomonnaie", value=crypto.title(), inline=True)
             embed.add_field(name="Montant", value=f"{montant}", inline=True)
             embed.add_field(name="Prix Unitaire", value=f"€{price:.2f}", inline=True)
-            embed.add_field(name="Coût Total", value=f"€{total_cost:.2f}", inline=False)
+            embed.add_field(name=total_label, value=f"€{total:.2f}", inline=False)
 
             await interaction.response.send_message(embed=embed)
-            await bot.log_transaction(interaction.user, "buy", crypto, montant, price)
+            bot.log_transaction(interaction.user, side, crypto, montant, price)
         else:
-            await interaction.response.send_message("❌ Solde insuffisant pour cet achat.", ephemeral=True)
+            await interaction.response.send_message(refused_message, ephemeral=True)
 
     except Exception as e:
-        logger.error(f"Error in buy command: {e}")
-        await interaction.response.send_message("❌ Erreur lors de l'achat.", ephemeral=True)
+        logger.error(f"Error in {log_label}: {e}")
+        await interaction.response.send_message(error_message, ephemeral=True)
+
+@bot.tree.command(name='buy', description='Acheter des cryptomonnaies')
+@app_commands.choices(crypto=CURRENCY_CHOICES)
+async def buy_crypto(interaction: discord.Interaction, crypto: app_commands.Choice[str], montant: float):
+    """Buy cryptocurrency"""
+    await run_trade(interaction, 'buy', crypto.value, montant)
 
 @bot.tree.command(name='sell', description='Vendre des cryptomonnaies')
-async def sell_crypto(interaction: discord.Interaction, crypto: str, montant: float):
+@app_commands.choices(crypto=CURRENCY_CHOICES)
+async def sell_crypto(interaction: discord.Interaction, crypto: app_commands.Choice[str], montant: float):
     """Sell cryptocurrency"""
-    try:
-        crypto = crypto.lower()
-
-        if crypto not in ['buxcoin', 'bitcoin']:
-            await interaction.response.send_message("❌ Cryptomonnaie invalide. Utilisez 'buxcoin' ou 'bitcoin'.", ephemeral=True)
-            return
-
-        if montant <= 0:
-            await interaction.response.send_message("❌ Le montant doit être positif.", ephemeral=True)
-            return
-
-        if montant < 0.0001:
-            await interaction.response.send_message("❌ Le montant minimum est 0.0001.", ephemeral=True)
-            return
-
-        price = bot.price_manager.get_price(crypto)
-        total_value = montant * price
-
-        success = bot.user_manager.sell_currency(str(interaction.user.id), crypto, montant, price)
-
-        if success:
-            embed = discord.Embed(
-                title="✅ Vente Réussie",
-                color=0xff0000,
-                timestamp=interaction.created_at
-            )
-            embed.add_field(name="Cryptomonnaie", value=crypto.title(), inline=True)
-            embed.add_field(name="Montant", value=f"{montant}", inline=True)
-            embed.add_field(name="Prix Unitaire", value=f"€{price:.2f}", inline=True)
-            embed.add_field(name="Valeur Totale", value=f"€{total_value:.2f}", inline=False)
-
-            await interaction.response.send_message(embed=embed)
-            await bot.log_transaction(interaction.user, "sell", crypto, montant, price)
-        else:
-            await interaction.response.send_message("❌ Vous n'avez pas assez de cette cryptomonnaie.", ephemeral=True)
-
-    except Exception as e:
-        logger.error(f"Error in sell command: {e}")
-        await interaction.response.send_message("❌ Erreur lors de la vente.", ephemeral=True)
+    await run_trade(interaction, 'sell', crypto.value, montant)
 
 # Admin slash commands (keeping prefix commands as well)
 @bot.tree.command(name='give', description='[ADMIN] Donner de l\'argent à un utilisateur')
+@require_admin
 async def give_money_slash(interaction: discord.Interaction, user: discord.Member, amount: float):
     """Give money to a user (admin only)"""
     try:
-        if not bot.admin_manager.is_admin(interaction.user.id):
-            await interaction.response.send_message("❌ Vous n'avez pas les permissions administrateur pour cette commande.", ephemeral=True)
-            return
-
-        if amount <= 0:
+        if not math.isfinite(amount) or amount <= 0:
             await interaction.response.send_message("❌ Le montant doit être positif.", ephemeral=True)
             return
 
-        success = bot.user_manager.update_balance(str(user.id), amount)
+        success = bot.user_manager.update_balance(user.id, amount)
 
         if success:
-            # Force save after admin command
-            bot.user_manager.save_users()
-
             embed = discord.Embed(
                 title="✅ Argent Donné",
                 color=0x00ff00,
@@ -953,7 +1173,7 @@ async def give_money_slash(interaction: discord.Interaction, user: discord.Membe
             embed.add_field(name="Admin", value=interaction.user.mention, inline=True)
 
             await interaction.response.send_message(embed=embed)
-            await bot.log_transaction(interaction.user, "admin_give", amount=amount)
+            bot.log_transaction(interaction.user, "admin_give", amount=amount)
         else:
             await interaction.response.send_message("❌ Erreur lors de l'ajout d'argent.", ephemeral=True)
 
@@ -962,37 +1182,19 @@ async def give_money_slash(interaction: discord.Interaction, user: discord.Membe
         await interaction.response.send_message("❌ Erreur lors de l'exécution de la commande.", ephemeral=True)
 
 @bot.tree.command(name='updatepriceset', description='[ADMIN] Changer manuellement le prix d\'une cryptomonnaie')
-async def update_price_set_slash(interaction: discord.Interaction, currency: str, price: float):
+@app_commands.choices(currency=CURRENCY_CHOICES)
+@require_admin
+async def update_price_set_slash(interaction: discord.Interaction, currency: app_commands.Choice[str], price: float):
     """Manually set the price of a currency (admin only)"""
     try:
-        if not bot.admin_manager.is_admin(interaction.user.id):
-            await interaction.response.send_message("❌ Vous n'avez pas les permissions administrateur pour cette commande.", ephemeral=True)
-            return
-
-        currency = currency.lower()
-
-        if currency not in ['buxcoin', 'bitcoin']:
-            await interaction.response.send_message("❌ Cryptomonnaie invalide. Utilisez 'buxcoin' ou 'bitcoin'.", ephemeral=True)
-            return
+        currency = currency.value
 
-        if price <= 0:
+        if not math.isfinite(price) or price <= 0:
             await interaction.response.send_message("❌ Le prix doit être positif.", ephemeral=True)
             return
 
         # Update price manually
-        bot.price_manager.current_prices[currency] = price
-
-        # Add to history
-        timestamp = datetime.now().isoformat()
-        bot.price_manager.price_history[currency].append({
-            'price': price,
-            'timestamp': timestamp,
-            'change': 0.0,
-            'manual': True
-        })
-
-        bot.price_manager.last_update = datetime.now()
-        bot.price_manager.save_prices()
+        bot.price_manager.set_manual_price(currency, price)
 
         embed = discord.Embed(
             title="✅ Prix Mis à Jour",
@@ -1004,20 +1206,17 @@ async def update_price_set_slash(interaction: discord.Interaction, currency: str
         embed.add_field(name="Admin", value=interaction.user.mention, inline=True)
 
         await interaction.response.send_message(embed=embed)
-        await bot.log_transaction(interaction.user, "admin_price_update", currency, price=price)
+        bot.log_transaction(interaction.user, "admin_price_update", currency, price=price)
 
     except Exception as e:
         logger.error(f"Error updating price: {e}")
         await interaction.response.send_message("❌ Erreur lors de la mise à jour du prix.", ephemeral=True)
 
 @bot.tree.command(name='setuplogschannel', description='[ADMIN] Configurer le canal de logs pour les transactions')
+@require_admin
 async def setup_logs_channel_slash(interaction: discord.Interaction):
     """Setup logs channel for transactions (admin only)"""
     try:
-        if not bot.admin_manager.is_admin(interaction.user.id):
-            await interaction.response.send_message("❌ Vous n'avez pas les permissions administrateur pour cette commande.", ephemeral=True)
-            return
-
         bot.admin_manager.set_log_channel(interaction.channel.id)
 
         embed = discord.Embed(
@@ -1033,15 +1232,25 @@ async def setup_logs_channel_slash(interaction: discord.Interaction):
         logger.error(f"Error setting up logs channel: {e}")
         await interaction.response.send_message("❌ Erreur lors de la configuration du canal de logs.", ephemeral=True)
 
+@functools.lru_cache(maxsize=512)
+def format_history_time(timestamp):
+    """Format a price history ISO timestamp as dd/mm HH:MM
+
+    History entries keep their timestamp for their whole life, so each one is
+    only parsed once; the cache is larger than the history kept per currency.
+    """
+    try:
+        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+        return dt.strftime("%d/%m %H:%M")
+    except:
+        return timestamp[:16]  # Fallback
+
 @bot.tree.command(name='pricehistory', description='Afficher l\'historique des prix d\'une cryptomonnaie')
-async def price_history(interaction: discord.Interaction, currency: str, limit: int = 10):
+@app_commands.choices(currency=CURRENCY_CHOICES)
+async def price_history(interaction: discord.Interaction, currency: app_commands.Choice[str], limit: int = 10):
     """Show price history for a currency"""
     try:
-        currency = currency.lower()
-
-        if currency not in ['buxcoin', 'bitcoin']:
-            await interaction.response.send_message("❌ Cryptomonnaie invalide. Utilisez 'buxcoin' ou 'bitcoin'.", ephemeral=True)
-            return
+        currency = currency.value
 
         if limit < 1 or limit > 30:
             await interaction.response.send_message("❌ La limite doit être entre 1 et 30.", ephemeral=True)
@@ -1060,27 +1269,20 @@ async def price_history(interaction: discord.Interaction, currency: str, limit:
         )
 
         # Show recent entries
-        history_text = ""
-        for entry in history[-limit:]:
-            timestamp = entry['timestamp']
+        lines = []
+        for entry in history:
             price = entry['price']
             change = entry.get('change', 0.0)
 
-            # Format timestamp
-            try:
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                formatted_time = dt.strftime("%d/%m %H:%M")
-            except:
-                formatted_time = timestamp[:16]  # Fallback
-
             # Format change
             change_symbol = "+" if change >= 0 else ""
             change_text = f"({change_symbol}€{change:.2f})" if change != 0 else ""
 
-            history_text += f"`{formatted_time}` - €{price:.2f} {change_text}\n"
+            lines.append(f"`{format_history_time(entry['timestamp'])}` - €{price:.2f} {change_text}\n")
+        history_text = "".join(lines)
 
         embed.add_field(
-            name=f"Dernières {len(history[-limit:])} entrées",
+            name=f"Dernières {len(history)} entrées",
             value=history_text or "Aucune donnée",
             inline=False
         )
@@ -1102,16 +1304,10 @@ async def price_history(interaction: discord.Interaction, currency: str, limit:
         await interaction.response.send_message("❌ Erreur lors de la récupération de l'historique des prix.", ephemeral=True)
 
 @bot.tree.command(name='addadmin', description='[ADMIN] Ajouter un administrateur')
+@require_admin_or_first
 async def add_admin_slash(interaction: discord.Interaction, user: discord.Member):
     """Add a user as admin (admin only or if no admins exist)"""
     try:
-        admin_list = bot.admin_manager.get_admins()
-
-        # Allow if user is admin OR if no admins exist (first admin)
-        if not bot.admin_manager.is_admin(interaction.user.id) and len(admin_list) > 0:
-            await interaction.response.send_message("❌ Vous n'avez pas les permissions administrateur pour cette commande.", ephemeral=True)
-            return
-
         if bot.admin_manager.is_admin(user.id):
             await interaction.response.send_message(f"❌ {user.mention} est déjà administrateur.", ephemeral=True)
             return
@@ -1127,27 +1323,23 @@ async def add_admin_slash(interaction: discord.Interaction, user: discord.Member
         embed.add_field(name="Ajouté par", value=interaction.user.mention, inline=True)
 
         await interaction.response.send_message(embed=embed)
-        await bot.log_transaction(interaction.user, "admin_add", user.name)
+        bot.log_transaction(interaction.user, "admin_add", user.name)
 
     except Exception as e:
         logger.error(f"Error adding admin: {e}")
         await interaction.response.send_message("❌ Erreur lors de l'ajout de l'administrateur.", ephemeral=True)
 
 @bot.tree.command(name='removeadmin', description='[ADMIN] Retirer les permissions administrateur d\'un utilisateur')
+@require_admin
 async def remove_admin_slash(interaction: discord.Interaction, user: discord.Member):
     """Remove admin permissions from a user (admin only)"""
     try:
-        if not bot.admin_manager.is_admin(interaction.user.id):
-            await interaction.response.send_message("❌ Vous n'avez pas les permissions administrateur pour cette commande.", ephemeral=True)
-            return
-
         if not bot.admin_manager.is_admin(user.id):
             await interaction.response.send_message(f"❌ {user.mention} n'est pas administrateur.", ephemeral=True)
             return
 
         # Prevent removing the last admin
-        admin_list = bot.admin_manager.get_admins()
-        if len(admin_list) <= 1:
+        if bot.admin_manager.admin_count <= 1:
             await interaction.response.send_message("❌ Impossible de retirer le dernier administrateur. Ajoutez d'abord un autre admin.", ephemeral=True)
             return
 
@@ -1168,7 +1360,7 @@ async def remove_admin_slash(interaction: discord.Interaction, user: discord.Mem
             embed.add_field(name="Retiré par", value=interaction.user.mention, inline=True)
 
             await interaction.response.send_message(embed=embed)
-            await bot.log_transaction(interaction.user, "admin_remove", user.name)
+            bot.log_transaction(interaction.user, "admin_remove", user.name)
         else:
             await interaction.response.send_message("❌ Erreur lors de la suppression des permissions.", ephemeral=True)
 
@@ -1178,50 +1370,53 @@ async def remove_admin_slash(interaction: discord.Interaction, user: discord.Mem
 
 
 
+def build_admin_help_embed_data():
+    """Build the /admin embed (static, so built once at import)"""
+    embed = discord.Embed(
+        title="👑 Commandes Administrateur",
+        description="Voici toutes les commandes administrateur disponibles",
+        color=0xff6b6b
+    )
+
+    # Slash commands
+    embed.add_field(
+        name="🔧 Commandes Slash",
+        value="• `/give <user> <montant>` - Donner de l'argent\n" +
+              "• `/updatepriceset <crypto> <prix>` - Changer le prix\n" +
+              "• `/setuplogschannel` - Configurer les logs\n" +
+              "• `/addadmin <user>` - Ajouter un administrateur\n" +
+              "• `/removeadmin <user>` - Retirer un administrateur",
+        inline=False
+    )
+
+    # Admin management commands
+    embed.add_field(
+        name="👥 Gestion des Utilisateurs",
+        value="• `/adminaction removeuser <user> <montant>` - Retirer de l'argent\n" +
+              "• `/adminaction resetuser <user>` - Reset le portefeuille\n" +
+              "• `/adminaction viewuser <user>` - Voir le portefeuille",
+        inline=False
+    )
+
+    # Info
+    embed.add_field(
+        name="ℹ️ Informations",
+        value="• `/admin` - Afficher cette aide\n" +
+              "• `/listadmins` - Liste des administrateurs",
+        inline=False
+    )
+
+    embed.set_footer(text="Utilisez ces commandes avec précaution")
+    return embed.to_dict()
+
+ADMIN_HELP_EMBED_DATA = build_admin_help_embed_data()
+
 @bot.tree.command(name='admin', description='[ADMIN] Afficher toutes les commandes administrateur')
+@require_admin
 async def admin_help(interaction: discord.Interaction):
     """Show all admin commands (admin only)"""
     try:
-        if not bot.admin_manager.is_admin(interaction.user.id):
-            await interaction.response.send_message("❌ Vous n'avez pas les permissions administrateur pour cette commande.", ephemeral=True)
-            return
-
-        embed = discord.Embed(
-            title="👑 Commandes Administrateur",
-            description="Voici toutes les commandes administrateur disponibles",
-            color=0xff6b6b,
-            timestamp=interaction.created_at
-        )
-
-        # Slash commands
-        embed.add_field(
-            name="🔧 Commandes Slash",
-            value="• `/give <user> <montant>` - Donner de l'argent\n" +
-                  "• `/updatepriceset <crypto> <prix>` - Changer le prix\n" +
-                  "• `/setuplogschannel` - Configurer les logs\n" +
-                  "• `/addadmin <user>` - Ajouter un administrateur\n" +
-                  "• `/removeadmin <user>` - Retirer un administrateur",
-            inline=False
-        )
-
-        # Admin management commands
-        embed.add_field(
-            name="👥 Gestion des Utilisateurs",
-            value="• `/adminaction removeuser <user> <montant>` - Retirer de l'argent\n" +
-                  "• `/adminaction resetuser <user>` - Reset le portefeuille\n" +
-                  "• `/adminaction viewuser <user>` - Voir le portefeuille",
-            inline=False
-        )
-
-        # Info
-        embed.add_field(
-            name="ℹ️ Informations",
-            value="• `/admin` - Afficher cette aide\n" +
-                  "• `/listadmins` - Liste des administrateurs",
-            inline=False
-        )
-
-        embed.set_footer(text="Utilisez ces commandes avec précaution")
+        embed = embed_from_dict(ADMIN_HELP_EMBED_DATA, interaction.created_at)
 
         await interaction.response.send_message(embed=embed)
 
@@ -1229,192 +1424,135 @@ async def admin_help(interaction: discord.Interaction):
         logger.error(f"Error showing admin help: {e}")
         await interaction.response.send_message("❌ Erreur lors de l'affichage des commandes admin.", ephemeral=True)
 
+async def admin_remove_user(interaction: discord.Interaction, user, montant):
+    """/adminaction removeuser: take money from a user's balance"""
+    if not user or montant is None:
+        await interaction.response.send_message("❌ Usage: `/adminaction removeuser <@user> <montant>`", ephemeral=True)
+        return
+
+    if not math.isfinite(montant) or montant <= 0:
+        await interaction.response.send_message("❌ Le montant doit être positif.", ephemeral=True)
+        return
+
+    success, wallet = bot.user_manager.adjust_balance(user.id, -montant)
+    if not success:
+        await interaction.response.send_message(f"❌ {user.mention} n'a que €{wallet['balance']:.2f} dans son portefeuille.", ephemeral=True)
+        return
+
+    embed = discord.Embed(
+        title="✅ Argent Retiré",
+        color=0xff0000,
+        timestamp=interaction.created_at
+    )
+    embed.add_field(name="Utilisateur", value=user.mention, inline=True)
+    embed.add_field(name="Montant Retiré", value=f"€{montant:.2f}", inline=True)
+    embed.add_field(name="Admin", value=interaction.user.mention, inline=True)
+
+    embed.add_field(name="Nouveau Solde", value=f"€{wallet['balance']:.2f}", inline=True)
+
+    await interaction.response.send_message(embed=embed)
+    bot.log_transaction(interaction.user, "admin_remove_money", amount=montant)
+
+async def admin_reset_user(interaction: discord.Interaction, user, montant):
+    """/adminaction resetuser: reset a user's wallet"""
+    if not user:
+        await interaction.response.send_message("❌ Usage: `/adminaction resetuser <@user>`", ephemeral=True)
+        return
+
+    # Reset user wallet to default values
+    bot.user_manager.reset_user(user.id)
+
+    embed = discord.Embed(
+        title="✅ Utilisateur Réinitialisé",
+        color=0xff9900,
+        timestamp=interaction.created_at
+    )
+    embed.add_field(name="Utilisateur", value=user.mention, inline=True)
+    embed.add_field(name="Admin", value=interaction.user.mention, inline=True)
+    embed.add_field(name="Nouveau Solde", value=f"€{bot.user_manager.config.INITIAL_BALANCE:.2f}", inline=True)
+
+    await interaction.response.send_message(embed=embed)
+    bot.log_transaction(interaction.user, "admin_reset_user", user.name)
+
+async def admin_view_user(interaction: discord.Interaction, user, montant):
+    """/adminaction viewuser: show a user's wallet"""
+    if not user:
+        await interaction.response.send_message("❌ Usage: `/adminaction viewuser <@user>`", ephemeral=True)
+        return
+
+    wallet = bot.user_manager.get_user_wallet(user.id)
+    prices = bot.price_manager.get_current_prices()
+
+    embed = build_user_wallet_embed(user, wallet, prices, interaction.created_at, interaction.user)
+
+    await interaction.response.send_message(embed=embed)
+
+# /adminaction sub-commands, by action name
+ADMIN_ACTIONS = {
+    'removeuser': admin_remove_user,
+    'resetuser': admin_reset_user,
+    'viewuser': admin_view_user,
+}
+
 @bot.tree.command(name='adminaction', description='[ADMIN] Actions administrateur avancées')
+@require_admin
 async def admin_actions(interaction: discord.Interaction, action: str, user: discord.Member = None, montant: float = None):
     """Advanced admin actions"""
     try:
-        if not bot.admin_manager.is_admin(interaction.user.id):
-            await interaction.response.send_message("❌ Vous n'avez pas les permissions administrateur pour cette commande.", ephemeral=True)
-            return
-
-        action = action.lower()
-
-        if action == "removeuser":
-            if not user or montant is None:
-                await interaction.response.send_message("❌ Usage: `/adminaction removeuser <@user> <montant>`", ephemeral=True)
-                return
-
-            if montant <= 0:
-                await interaction.response.send_message("❌ Le montant doit être positif.", ephemeral=True)
-                return
-
-            wallet = bot.user_manager.get_user_wallet(str(user.id))
-            if wallet['balance'] < montant:
-                await interaction.response.send_message(f"❌ {user.mention} n'a que €{wallet['balance']:.2f} dans son portefeuille.", ephemeral=True)
-                return
-
-            success = bot.user_manager.update_balance(str(user.id), -montant)
-
-            if success:
-                embed = discord.Embed(
-                    title="✅ Argent Retiré",
-                    color=0xff0000,
-                    timestamp=interaction.created_at
-                )
-                embed.add_field(name="Utilisateur", value=user.mention, inline=True)
-                embed.add_field(name="Montant Retiré", value=f"€{montant:.2f}", inline=True)
-                embed.add_field(name="Admin", value=interaction.user.mention, inline=True)
-
-                new_wallet = bot.user_manager.get_user_wallet(str(user.id))
-                embed.add_field(name="Nouveau Solde", value=f"€{new_wallet['balance']:.2f}", inline=True)
-
-                await interaction.response.send_message(embed=embed)
-                await bot.log_transaction(interaction.user, "admin_remove_money", amount=montant)
-            else:
-                await interaction.response.send_message("❌ Erreur lors du retrait d'argent.", ephemeral=True)
-
-        elif action == "resetuser":
-            if not user:
-                await interaction.response.send_message("❌ Usage: `/adminaction resetuser <@user>`", ephemeral=True)
-                return
-
-            # Reset user wallet to default values
-            bot.user_manager.users[str(user.id)] = {
-                'balance': bot.user_manager.config.INITIAL_BALANCE,
-                'buxcoin': 0.0,
-                'bitcoin': 0.0,
-                'transactions': []
-            }
-            bot.user_manager.save_users()
-
-            embed = discord.Embed(
-                title="✅ Utilisateur Réinitialisé",
-                color=0xff9900,
-                timestamp=interaction.created_at
-            )
-            embed.add_field(name="Utilisateur", value=user.mention, inline=True)
-            embed.add_field(name="Admin", value=interaction.user.mention, inline=True)
-            embed.add_field(name="Nouveau Solde", value=f"€{bot.user_manager.config.INITIAL_BALANCE:.2f}", inline=True)
-
-            await interaction.response.send_message(embed=embed)
-            await bot.log_transaction(interaction.user, "admin_reset_user", user.name)
-
-        elif action == "viewuser":
-            if not user:
-                await interaction.response.send_message("❌ Usage: `/adminaction viewuser <@user>`", ephemeral=True)
-                return
-
-            wallet = bot.user_manager.get_user_wallet(str(user.id))
-            prices = bot.price_manager.get_current_prices()
-
-            # Calculate crypto values
-            buxcoin_value = wallet['buxcoin'] * prices['buxcoin']
-            bitcoin_value = wallet['bitcoin'] * prices['bitcoin']
-            total_crypto_value = buxcoin_value + bitcoin_value
-
-            embed = discord.Embed(
-                title=f"👤 Portefeuille de {user.display_name}",
-                color=0x00bfff,
-                timestamp=interaction.created_at
-            )
-
-            embed.add_field(
-                name="💵 Solde",
-                value=f"€{wallet['balance']:.2f}",
-                inline=True
-            )
-
-            embed.add_field(
-                name="💰 Buxcoin",
-                value=f"{wallet['buxcoin']:.4f} BUX\n€{buxcoin_value:.2f}",
-                inline=True
-            )
-
-            embed.add_field(
-                name="🪙 Bitcoin",
-                value=f"{wallet['bitcoin']:.4f} BTC\n€{bitcoin_value:.2f}",
-                inline=True
-            )
-
-            embed.add_field(
-                name="💎 Valeur Totale Crypto",
-                value=f"€{total_crypto_value:.2f}",
-                inline=False
-            )
-
-            embed.add_field(
-                name="📊 Valeur Totale",
-                value=f"€{wallet['balance'] + total_crypto_value:.2f}",
-                inline=False
-            )
-
-            # Show recent transactions
-            if wallet['transactions']:
-                recent_transactions = wallet['transactions'][-3:]  # Last 3 transactions
-                trans_text = ""
-                for trans in recent_transactions:
-                    trans_type = trans['type']
-                    currency = trans['currency']
-                    amount = trans['amount']
-                    trans_text += f"• {trans_type.title()} {amount:.4f} {currency}\n"
-
-                embed.add_field(
-                    name="📝 Dernières Transactions",
-                    value=trans_text or "Aucune transaction",
-                    inline=False
-                )
-
-            embed.set_footer(text=f"Demandé par {interaction.user.display_name}")
-
-            await interaction.response.send_message(embed=embed)
-
-        else:
+        handler = ADMIN_ACTIONS.get(action.lower())
+        if handler is None:
             await interaction.response.send_message(
                 "❌ Action invalide. Actions disponibles: `removeuser`, `resetuser`, `viewuser`", 
                 ephemeral=True
             )
+            return
+
+        await handler(interaction, user, montant)
 
     except Exception as e:
         logger.error(f"Error in admin action: {e}")
         await interaction.response.send_message("❌ Erreur lors de l'exécution de l'action admin.", ephemeral=True)
 
+def build_admin_prefix_help_embed_data():
+    """Build the !admin embed (static, so built once at import)"""
+    embed = discord.Embed(
+        title="👑 Commandes Administrateur (Préfixe)",
+        description="Voici toutes les commandes administrateur avec préfixe `!`",
+        color=0xff6b6b
+    )
+
+    # Prefix commands
+    embed.add_field(
+        name="🔧 Commandes Préfixe (!)",
+        value="• `!give <user> <montant>` - Donner de l'argent\n" +
+              "• `!removeuser <user> <montant>` - Retirer de l'argent\n" +
+              "• `!resetuser <user>` - Reset le portefeuille\n" +
+              "• `!viewuser <user>` - Voir le portefeuille\n" +
+              "• `!updateprice <crypto> <prix>` - Changer le prix\n" +
+              "• `!addadmin <user>` - Ajouter un admin\n" +
+              "• `!removeadmin <user>` - Retirer un admin\n" +
+              "• `!setlogschannel` - Configurer les logs",
+        inline=False
+    )
+
+    embed.add_field(
+        name="ℹ️ Informations",
+        value="• `!admin` - Afficher cette aide",
+        inline=False
+    )
+
+    embed.set_footer(text="Utilisez ces commandes avec précaution")
+    return embed.to_dict()
+
+ADMIN_PREFIX_HELP_EMBED_DATA = build_admin_prefix_help_embed_data()
+
 # Prefix commands for admin
 @bot.command(name='admin')
+@require_admin
 async def admin_help_prefix(ctx):
     """Show all admin commands (admin only)"""
     try:
-        if not bot.admin_manager.is_admin(ctx.author.id):
-            await ctx.send("❌ Vous n'avez pas les permissions administrateur pour cette commande.")
-            return
-
-        embed = discord.Embed(
-            title="👑 Commandes Administrateur (Préfixe)",
-            description="Voici toutes les commandes administrateur avec préfixe `!`",
-            color=0xff6b6b,
-            timestamp=ctx.message.created_at
-        )
-
-        # Prefix commands
-        embed.add_field(
-            name="🔧 Commandes Préfixe (!)",
-            value="• `!give <user> <montant>` - Donner de l'argent\n" +
-                  "• `!removeuser <user> <montant>` - Retirer de l'argent\n" +
-                  "• `!resetuser <user>` - Reset le portefeuille\n" +
-                  "• `!viewuser <user>` - Voir le portefeuille\n" +
-                  "• `!updateprice <crypto> <prix>` - Changer le prix\n" +
-                  "• `!addadmin <user>` - Ajouter un admin\n" +
-                  "• `!removeadmin <user>` - Retirer un admin\n" +
-                  "• `!setlogschannel` - Configurer les logs",
-            inline=False
-        )
-
-        embed.add_field(
-            name="ℹ️ Informations",
-            value="• `!admin` - Afficher cette aide",
-            inline=False
-        )
-
-        embed.set_footer(text="Utilisez ces commandes avec précaution")
+        embed = embed_from_dict(ADMIN_PREFIX_HELP_EMBED_DATA, ctx.message.created_at)
         await ctx.send(embed=embed)
 
     except Exception as e:
@@ -1422,23 +1560,17 @@ async def admin_help_prefix(ctx):
         await ctx.send("❌ Erreur lors de l'affichage des commandes admin.")
 
 @bot.command(name='give')
+@require_admin
 async def give_money_prefix(ctx, user: discord.Member, amount: float):
     """Give money to a user (admin only)"""
     try:
-        if not bot.admin_manager.is_admin(ctx.author.id):
-            await ctx.send("❌ Vous n'avez pas les permissions administrateur pour cette commande.")
-            return
-
-        if amount <= 0:
+        if not math.isfinite(amount) or amount <= 0:
             await ctx.send("❌ Le montant doit être positif.")
             return
 
-        success = bot.user_manager.update_balance(str(user.id), amount)
+        success = bot.user_manager.update_balance(user.id, amount)
 
         if success:
-            # Force save immediately after admin action
-            bot.user_manager.save_users()
-
             embed = discord.Embed(
                 title="✅ Argent Donné",
                 color=0x00ff00,
@@ -1449,7 +1581,7 @@ async def give_money_prefix(ctx, user: discord.Member, amount: float):
             embed.add_field(name="Admin", value=ctx.author.mention, inline=True)
 
             await ctx.send(embed=embed)
-            await bot.log_transaction(ctx.author, "admin_give", amount=amount)
+            bot.log_transaction(ctx.author, "admin_give", amount=amount)
         else:
             await ctx.send("❌ Erreur lors de l'ajout d'argent.")
 
@@ -1458,65 +1590,44 @@ async def give_money_prefix(ctx, user: discord.Member, amount: float):
         await ctx.send("❌ Erreur lors de l'exécution de la commande.")
 
 @bot.command(name='removeuser')
+@require_admin
 async def remove_user_money_prefix(ctx, user: discord.Member, amount: float):
     """Remove money from a user (admin only)"""
     try:
-        if not bot.admin_manager.is_admin(ctx.author.id):
-            await ctx.send("❌ Vous n'avez pas les permissions administrateur pour cette commande.")
-            return
-
-        if amount <= 0:
+        if not math.isfinite(amount) or amount <= 0:
             await ctx.send("❌ Le montant doit être positif.")
             return
 
-        wallet = bot.user_manager.get_user_wallet(str(user.id))
-        if wallet['balance'] < amount:
+        success, wallet = bot.user_manager.adjust_balance(user.id, -amount)
+        if not success:
             await ctx.send(f"❌ {user.mention} n'a que €{wallet['balance']:.2f} dans son portefeuille.")
             return
 
-        success = bot.user_manager.update_balance(str(user.id), -amount)
-
-        if success:
-            # Force save immediately after admin action
-            bot.user_manager.save_users()
-
-            embed = discord.Embed(
-                title="✅ Argent Retiré",
-                color=0xff0000,
-                timestamp=ctx.message.created_at
-            )
-            embed.add_field(name="Utilisateur", value=user.mention, inline=True)
-            embed.add_field(name="Montant Retiré", value=f"€{amount:.2f}", inline=True)
-            embed.add_field(name="Admin", value=ctx.author.mention, inline=True)
+        embed = discord.Embed(
+            title="✅ Argent Retiré",
+            color=0xff0000,
+            timestamp=ctx.message.created_at
+        )
+        embed.add_field(name="Utilisateur", value=user.mention, inline=True)
+        embed.add_field(name="Montant Retiré", value=f"€{amount:.2f}", inline=True)
+        embed.add_field(name="Admin", value=ctx.author.mention, inline=True)
 
-            new_wallet = bot.user_manager.get_user_wallet(str(user.id))
-            embed.add_field(name="Nouveau Solde", value=f"€{new_wallet['balance']:.2f}", inline=True)
+        embed.add_field(name="Nouveau Solde", value=f"€{wallet['balance']:.2f}", inline=True)
 
-            await ctx.send(embed=embed)
-            await bot.log_transaction(ctx.author, "admin_remove_money", amount=amount)
-        else:
-            await ctx.send("❌ Erreur lors du retrait d'argent.")
+        await ctx.send(embed=embed)
+        bot.log_transaction(ctx.author, "admin_remove_money", amount=amount)
 
     except Exception as e:
         logger.error(f"Error removing money: {e}")
         await ctx.send("❌ Erreur lors de l'exécution de la commande.")
 
 @bot.command(name='resetuser')
+@require_admin
 async def reset_user_prefix(ctx, user: discord.Member):
     """Reset user wallet (admin only)"""
     try:
-        if not bot.admin_manager.is_admin(ctx.author.id):
-            await ctx.send("❌ Vous n'avez pas les permissions administrateur pour cette commande.")
-            return
-
         # Reset user wallet to default values
-        bot.user_manager.users[str(user.id)] = {
-            'balance': bot.user_manager.config.INITIAL_BALANCE,
-            'buxcoin': 0.0,
-            'bitcoin': 0.0,
-            'transactions': []
-        }
-        bot.user_manager.save_users()
+        bot.user_manager.reset_user(user.id)
 
         embed = discord.Embed(
             title="✅ Utilisateur Réinitialisé",
@@ -1528,81 +1639,21 @@ async def reset_user_prefix(ctx, user: discord.Member):
         embed.add_field(name="Nouveau Solde", value=f"€{bot.user_manager.config.INITIAL_BALANCE:.2f}", inline=True)
 
         await ctx.send(embed=embed)
-        await bot.log_transaction(ctx.author, "admin_reset_user", user.name)
+        bot.log_transaction(ctx.author, "admin_reset_user", user.name)
 
     except Exception as e:
         logger.error(f"Error resetting user: {e}")
         await ctx.send("❌ Erreur lors de la réinitialisation de l'utilisateur.")
 
 @bot.command(name='viewuser')
+@require_admin
 async def view_user_prefix(ctx, user: discord.Member):
     """View user wallet (admin only)"""
     try:
-        if not bot.admin_manager.is_admin(ctx.author.id):
-            await ctx.send("❌ Vous n'avez pas les permissions administrateur pour cette commande.")
-            return
-
-        wallet = bot.user_manager.get_user_wallet(str(user.id))
+        wallet = bot.user_manager.get_user_wallet(user.id)
         prices = bot.price_manager.get_current_prices()
 
-        # Calculate crypto values
-        buxcoin_value = wallet['buxcoin'] * prices['buxcoin']
-        bitcoin_value = wallet['bitcoin'] * prices['bitcoin']
-        total_crypto_value = buxcoin_value + bitcoin_value
-
-        embed = discord.Embed(
-            title=f"👤 Portefeuille de {user.display_name}",
-            color=0x00bfff,
-            timestamp=ctx.message.created_at
-        )
-
-        embed.add_field(
-            name="💵 Solde",
-            value=f"€{wallet['balance']:.2f}",
-            inline=True
-        )
-
-        embed.add_field(
-            name="💰 Buxcoin",
-            value=f"{wallet['buxcoin']:.4f} BUX\n€{buxcoin_value:.2f}",
-            inline=True
-        )
-
-        embed.add_field(
-            name="🪙 Bitcoin",
-            value=f"{wallet['bitcoin']:.4f} BTC\n€{bitcoin_value:.2f}",
-            inline=True
-        )
-
-        embed.add_field(
-            name="💎 Valeur Totale Crypto",
-            value=f"€{total_crypto_value:.2f}",
-            inline=False
-        )
-
-        embed.add_field(
-            name="📊 Valeur Totale",
-            value=f"€{wallet['balance'] + total_crypto_value:.2f}",
-            inline=False
-        )
-
-        # Show recent transactions
-        if wallet['transactions']:
-            recent_transactions = wallet['transactions'][-3:]  # Last 3 transactions
-            trans_text = ""
-            for trans in recent_transactions:
-                trans_type = trans['type']
-                currency = trans['currency']
-                amount = trans['amount']
-                trans_text += f"• {trans_type.title()} {amount:.4f} {currency}\n"
-
-            embed.add_field(
-                name="📝 Dernières Transactions",
-                value=trans_text or "Aucune transaction",
-                inline=False
-            )
-
-        embed.set_footer(text=f"Demandé par {ctx.author.display_name}")
+        embed = build_user_wallet_embed(user, wallet, prices, ctx.message.created_at, ctx.author)
         await ctx.send(embed=embed)
 
     except Exception as e:
@@ -1610,20 +1661,17 @@ async def view_user_prefix(ctx, user: discord.Member):
         await ctx.send("❌ Erreur lors de la récupération du portefeuille.")
 
 @bot.command(name='updateprice')
+@require_admin
 async def update_price_prefix(ctx, currency: str, price: float):
     """Update cryptocurrency price (admin only)"""
     try:
-        if not bot.admin_manager.is_admin(ctx.author.id):
-            await ctx.send("❌ Vous n'avez pas les permissions administrateur pour cette commande.")
-            return
-
         currency = currency.lower()
 
-        if currency not in ['buxcoin', 'bitcoin']:
+        if currency not in CONFIG.VALID_CURRENCIES:
             await ctx.send("❌ Cryptomonnaie invalide. Utilisez 'buxcoin' ou 'bitcoin'.")
             return
 
-        if price <= 0:
+        if not math.isfinite(price) or price <= 0:
             await ctx.send("❌ Le prix doit être positif.")
             return
 
@@ -1632,22 +1680,7 @@ async def update_price_prefix(ctx, currency: str, price: float):
             return
 
         # Update price manually
-        bot.price_manager.current_prices[currency] = price
-
-        # Add to history
-        timestamp = datetime.now().isoformat()
-        bot.price_manager.price_history[currency].append({
-            'price': price,
-            'timestamp': timestamp,
-            'change': 0.0,
-            'manual': True
-        })
-
-        bot.price_manager.last_update = datetime.now()
-        bot.price_manager.save_prices()
-
-        # Also force save user data to ensure consistency
-        bot.user_manager.save_users()
+        bot.price_manager.set_manual_price(currency, price)
 
         embed = discord.Embed(
             title="✅ Prix Mis à Jour",
@@ -1659,23 +1692,17 @@ async def update_price_prefix(ctx, currency: str, price: float):
         embed.add_field(name="Admin", value=ctx.author.mention, inline=True)
 
         await ctx.send(embed=embed)
-        await bot.log_transaction(ctx.author, "admin_price_update", currency, price=price)
+        bot.log_transaction(ctx.author, "admin_price_update", currency, price=price)
 
     except Exception as e:
         logger.error(f"Error updating price: {e}")
         await ctx.send("❌ Erreur lors de la mise à jour du prix.")
 
 @bot.command(name='addadmin')
+@require_admin_or_first
 async def add_admin_prefix(ctx, user: discord.Member):
     """Add admin (admin only or first admin)"""
     try:
-        admin_list = bot.admin_manager.get_admins()
-
-        # Allow if user is admin OR if no admins exist (first admin)
-        if not bot.admin_manager.is_admin(ctx.author.id) and len(admin_list) > 0:
-            await ctx.send("❌ Vous n'avez pas les permissions administrateur pour cette commande.")
-            return
-
         if bot.admin_manager.is_admin(user.id):
             await ctx.send(f"❌ {user.mention} est déjà administrateur.")
             return
@@ -1691,27 +1718,23 @@ async def add_admin_prefix(ctx, user: discord.Member):
         embed.add_field(name="Ajouté par", value=ctx.author.mention, inline=True)
 
         await ctx.send(embed=embed)
-        await bot.log_transaction(ctx.author, "admin_add", user.name)
+        bot.log_transaction(ctx.author, "admin_add", user.name)
 
     except Exception as e:
         logger.error(f"Error adding admin: {e}")
         await ctx.send("❌ Erreur lors de l'ajout de l'administrateur.")
 
 @bot.command(name='removeadmin')
+@require_admin
 async def remove_admin_prefix(ctx, user: discord.Member):
     """Remove admin (admin only)"""
     try:
-        if not bot.admin_manager.is_admin(ctx.author.id):
-            await ctx.send("❌ Vous n'avez pas les permissions administrateur pour cette commande.")
-            return
-
         if not bot.admin_manager.is_admin(user.id):
             await ctx.send(f"❌ {user.mention} n'est pas administrateur.")
             return
 
         # Prevent removing the last admin
-        admin_list = bot.admin_manager.get_admins()
-        if len(admin_list) <= 1:
+        if bot.admin_manager.admin_count <= 1:
             await ctx.send("❌ Impossible de retirer le dernier administrateur. Ajoutez d'abord un autre admin.")
             return
 
@@ -1732,7 +1755,7 @@ async def remove_admin_prefix(ctx, user: discord.Member):
             embed.add_field(name="Retiré par", value=ctx.author.mention, inline=True)
 
             await ctx.send(embed=embed)
-            await bot.log_transaction(ctx.author, "admin_remove", user.name)
+            bot.log_transaction(ctx.author, "admin_remove", user.name)
         else:
             await ctx.send("❌ Erreur lors de la suppression des permissions.")
 
@@ -1741,13 +1764,10 @@ async def remove_admin_prefix(ctx, user: discord.Member):
         await ctx.send("❌ Erreur lors de la suppression de l'administrateur.")
 
 @bot.command(name='setlogschannel')
+@require_admin
 async def set_logs_channel_prefix(ctx):
     """Set logs channel (admin only)"""
     try:
-        if not bot.admin_manager.is_admin(ctx.author.id):
-            await ctx.send("❌ Vous n'avez pas les permissions administrateur pour cette commande.")
-            return
-
         bot.admin_manager.set_log_channel(ctx.channel.id)
 
         embed = discord.Embed(
@@ -1792,6 +1812,9 @@ if __name__ == "__main__":
     signal.signal(signal.SIGINT, signal_handler)  # Ctrl+C
     signal.signal(signal.SIGTERM, signal_handler)  # Termination signal
 
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     try:
         bot.run(token)
     except KeyboardInterrupt:
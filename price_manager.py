@@ -1,11 +1,17 @@
 
-import json
+import asyncio
+import atexit
 import os
 import random
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import logging
-from bot_config import BotConfig
+import math
+import threading
+from collections import deque
+from itertools import islice
+from bot_config import CONFIG
+from json_store import atomic_write, dumps, read_json
 
 logger = logging.getLogger(__name__)
 
@@ -13,35 +19,35 @@ class PriceManager:
     """Manages cryptocurrency prices and history"""
 
     def __init__(self):
-        self.config = BotConfig()
+        self.config = CONFIG
         self.prices_file = self.config.PRICES_FILE
-        self.ensure_data_directory()
+        self._dirty = False
+        self._save_handle = None
+        # Saves can run from the debounce timer's worker thread and the event loop
+        self._save_lock = threading.Lock()
+        # Copy of current_prices handed out by get_current_prices, with the
+        # (current_prices, last_update) objects it was taken from
+        self._prices_snapshot = (None, None, {})
         self.load_prices()
-
-    def ensure_data_directory(self):
-        """Ensure the data directory exists"""
-        if not os.path.exists(self.config.DATA_DIR):
-            os.makedirs(self.config.DATA_DIR)
-            logger.info(f"Created data directory: {self.config.DATA_DIR}")
+        atexit.register(self.flush)
 
     def load_prices(self):
         """Load prices from JSON file or initialize with default values"""
         try:
             if os.path.exists(self.prices_file):
-                with open(self.prices_file, 'r') as f:
-                    data = json.load(f)
-                    self.current_prices = data.get('current_prices', {})
-                    self.price_history = data.get('price_history', {})
-                    self.last_update = data.get('last_update', None)
-
-                    # Convert last_update string back to datetime if it exists
-                    if self.last_update:
-                        try:
-                            self.last_update = datetime.fromisoformat(self.last_update)
-                        except ValueError:
-                            self.last_update = None
-
-                    logger.info("Loaded prices from file")
+                data = read_json(self.prices_file)
+                self.current_prices = data.get('current_prices', {})
+                self.set_price_history(data.get('price_history', {}))
+                self.last_update = data.get('last_update', None)
+
+                # Convert last_update string back to datetime if it exists
+                if self.last_update:
+                    try:
+                        self.last_update = datetime.fromisoformat(self.last_update)
+                    except ValueError:
+                        self.last_update = None
+
+                logger.info("Loaded prices from file")
             else:
                 self.initialize_default_prices()
                 logger.info("Initialized default prices")
@@ -55,10 +61,7 @@ class PriceManager:
             'buxcoin': self.config.INITIAL_PRICE,
             'bitcoin': self.config.INITIAL_PRICE
         }
-        self.price_history = {
-            'buxcoin': [],
-            'bitcoin': []
-        }
+        self.set_price_history({})
         self.last_update = None
 
         # Add initial prices to history
@@ -70,17 +73,19 @@ class PriceManager:
                 'change': 0.0
             })
 
+        self._dirty = True
         self.save_prices()
 
     def force_reset_to_initial_price(self):
         """Force reset all prices to initial value (3000€)"""
         logger.info(f"Force resetting all prices to €{self.config.INITIAL_PRICE}")
 
+        now = datetime.now()
+        timestamp = now.isoformat()
         for currency in self.config.CURRENCIES:
             self.current_prices[currency] = self.config.INITIAL_PRICE
 
             # Add reset entry to history
-            timestamp = datetime.now().isoformat()
             self.price_history[currency].append({
                 'price': self.config.INITIAL_PRICE,
                 'timestamp': timestamp,
@@ -88,29 +93,103 @@ class PriceManager:
                 'reset': True
             })
 
-        self.last_update = datetime.now()
-        self.save_prices()
+        self.last_update = now
+        self.schedule_save()
         logger.info(f"All prices reset to €{self.config.INITIAL_PRICE}")
 
+    def set_manual_price(self, currency: str, price: float):
+        """Set a price by hand (admin commands), recorded in history as a manual entry"""
+        if not math.isfinite(price) or price <= 0:
+            raise ValueError(f"Invalid price for {currency}: {price!r}")
+
+        now = datetime.now()
+        self.current_prices[currency] = price
+        self.price_history[currency].append({
+            'price': price,
+            'timestamp': now.isoformat(),
+            'change': 0.0,
+            'manual': True
+        })
+
+        self.last_update = now
+        self.schedule_save()
+
     def save_prices(self):
-        """Save current prices and history to JSON file"""
-        try:
-            data = {
-                'current_prices': self.current_prices,
-                'price_history': self.price_history,
-                'last_update': self.last_update.isoformat() if self.last_update else None
-            }
+        """Save current prices and history to JSON file (atomically, via a temporary file)"""
+        with self._save_lock:
+            # Cleared before encoding, so changes made while writing mark the prices dirty again
+            self._dirty = False
+            try:
+                data = {
+                    'current_prices': self.current_prices,
+                    'price_history': self.price_history_data(),
+                    'last_update': self.last_update.isoformat() if self.last_update else None
+                }
 
-            with open(self.prices_file, 'w') as f:
-                json.dump(data, f, indent=2)
+                # Encode in one call before touching the file, so the write is a single syscall
+                # Compact by default (about half the bytes); PRICES_JSON_PRETTY=1 keeps it indented
+                atomic_write(self.prices_file, dumps(data, pretty=bool(os.getenv('PRICES_JSON_PRETTY'))))
 
-            logger.info("Saved prices to file")
-        except Exception as e:
-            logger.error(f"Error saving prices: {e}")
+                logger.info("Saved prices to file")
+            except Exception as e:
+                self._dirty = True
+                logger.error(f"Error saving prices: {e}")
+
+    @property
+    def dirty(self) -> bool:
+        """Whether there are price changes not yet written to disk"""
+        return self._dirty
+
+    def flush(self):
+        """Write pending price changes to disk, if any"""
+        if self._dirty:
+            self.save_prices()
+
+    def schedule_save(self):
+        """Mark the prices as changed and write them shortly, off the event loop
+
+        Changes made within SAVE_DEBOUNCE_SECONDS share a single write. Without a
+        running event loop (startup, shutdown) the write happens immediately.
+        """
+        self._dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save_prices()
+            return
+        if self._save_handle is None:
+            self._save_handle = loop.call_later(self.config.SAVE_DEBOUNCE_SECONDS, self._save_later)
+
+    def _save_later(self):
+        """Debounce timer callback: flush pending changes in a worker thread"""
+        self._save_handle = None
+        if self._dirty:
+            asyncio.get_running_loop().run_in_executor(None, self.flush)
+
+    def set_price_history(self, history: Dict[str, List[Dict]]):
+        """Replace the price history, keeping the last PRICE_HISTORY_LIMIT entries per currency"""
+        # deque(maxlen=...) drops the oldest entry on append, no list rebuild per tick
+        self.price_history = {
+            currency: deque(history.get(currency, ()), maxlen=self.config.PRICE_HISTORY_LIMIT)
+            for currency in self.config.CURRENCIES
+        }
+
+    def price_history_data(self) -> Dict[str, List[Dict]]:
+        """Price history as plain lists, for JSON encoding"""
+        return {currency: list(history) for currency, history in self.price_history.items()}
 
     def get_current_prices(self) -> Dict[str, float]:
-        """Get current prices for all currencies"""
-        return self.current_prices.copy()
+        """Get current prices for all currencies
+
+        The copy is shared between callers until the prices change (every
+        change sets last_update or replaces current_prices), so treat it as
+        read-only.
+        """
+        prices, last_update, snapshot = self._prices_snapshot
+        if prices is not self.current_prices or last_update is not self.last_update:
+            snapshot = self.current_prices.copy()
+            self._prices_snapshot = (self.current_prices, self.last_update, snapshot)
+        return snapshot
 
     def get_price(self, currency: str) -> float:
         """Get current price for a specific currency"""
@@ -121,19 +200,24 @@ class PriceManager:
         return self.last_update
 
     def get_price_history(self, currency: str, limit: int = 30) -> List[Dict]:
-        """Get price history for a currency"""
+        """Get price history for a currency (at most the last `limit` entries if limit > 0)"""
         currency = currency.lower()
         if currency not in self.price_history:
             return []
 
         history = self.price_history[currency]
-        return history[-limit:] if limit > 0 else history
+        start = max(0, len(history) - limit) if limit > 0 else 0
+        return list(islice(history, start, None))
 
     def update_prices(self):
         """Update prices with random fluctuations"""
         try:
             logger.info("Starting price update...")
 
+            # One timestamp for the whole tick: every history entry and last_update match
+            now = datetime.now()
+            timestamp = now.isoformat()
+
             for currency in self.config.CURRENCIES:
                 old_price = self.current_prices[currency]
 
@@ -156,7 +240,7 @@ class PriceManager:
                 else:
                     # Changement très minimal (28% de chance) - stabilité
                     change_percent = random.uniform(0.001, 0.005)  # 0.1% à 0.5%
-                    if random.choice([True, False]):
+                    if random.random() < 0.5:
                         change = old_price * change_percent
                     else:
                         change = -(old_price * change_percent)
@@ -172,24 +256,19 @@ class PriceManager:
                 self.current_prices[currency] = new_price
 
                 # Add to history
-                timestamp = datetime.now().isoformat()
                 self.price_history[currency].append({
                     'price': new_price,
                     'timestamp': timestamp,
                     'change': change
                 })
 
-                # Keep only last 100 entries in history to prevent file from growing too large
-                if len(self.price_history[currency]) > 100:
-                    self.price_history[currency] = self.price_history[currency][-100:]
-
                 logger.info(f"Updated {currency}: €{old_price:.2f} → €{new_price:.2f} (change: €{change:+.2f})")
 
             # Update last update timestamp
-            self.last_update = datetime.now()
+            self.last_update = now
 
             # Save to file
-            self.save_prices()
+            self.schedule_save()
 
             logger.info("Price update completed successfully")
 
@@ -1,7 +1,7 @@
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from bot_config import BotConfig
+from bot_config import CONFIG
 
 logger = logging.getLogger(__name__)
 
@@ -10,8 +10,10 @@ class PriceScheduler:
 
     def __init__(self, price_manager):
         self.price_manager = price_manager
-        self.config = BotConfig()
+        self.config = CONFIG
         self.is_running = False
+        # Set by stop_scheduler to wake the loop out of its wait
+        self._stop = asyncio.Event()
 
     async def start_scheduler(self):
         """Start the price update scheduler"""
@@ -20,20 +22,35 @@ class PriceScheduler:
             return
 
         self.is_running = True
+        self._stop.clear()
         logger.info(f"Starting price scheduler with {self.config.UPDATE_INTERVAL_MINUTES} minute intervals")
 
+        loop = asyncio.get_running_loop()
+        interval = self.config.UPDATE_INTERVAL_MINUTES * 60
+        # Updates are due at fixed times from here, so their own run time doesn't shift the schedule
+        deadline = loop.time()
+
         while self.is_running:
             try:
                 # Update prices
                 await self.update_prices()
 
-                # Wait for the next update
-                await asyncio.sleep(self.config.UPDATE_INTERVAL_MINUTES * 60)
+                # Wait for the next update (or until stopped); skip ticks missed while the loop was busy
+                deadline = max(deadline + interval, loop.time())
+                await self._wait(deadline - loop.time())
 
             except Exception as e:
                 logger.error(f"Error in price scheduler: {e}")
                 # Wait a bit before retrying
-                await asyncio.sleep(60)
+                await self._wait(60)
+                deadline = loop.time()
+
+    async def _wait(self, seconds: float):
+        """Sleep for up to `seconds`, returning early if the scheduler is stopped"""
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout=max(0.0, seconds))
+        except asyncio.TimeoutError:
+            pass
 
     async def update_prices(self):
         """Update cryptocurrency prices"""
@@ -41,7 +58,7 @@ class PriceScheduler:
             logger.info("Updating cryptocurrency prices...")
 
             # Update prices for all currencies
-            old_prices = self.price_manager.get_current_prices().copy()
+            old_prices = self.price_manager.get_current_prices()  # Already a copy
             self.price_manager.update_prices()
             new_prices = self.price_manager.get_current_prices()
 
@@ -61,4 +78,5 @@ class PriceScheduler:
     def stop_scheduler(self):
         """Stop the price scheduler"""
         self.is_running = False
+        self._stop.set()
         logger.info("Price scheduler stopped")
\ No newline at end of file
@@ -1,10 +1,15 @@
 
-import json
+import asyncio
+import atexit
 import os
 import logging
+import math
+import shutil
+import threading
 from datetime import datetime
-from typing import Dict, Optional, List
-from bot_config import BotConfig
+from typing import Dict, Optional, List, Tuple
+from bot_config import CONFIG
+from json_store import atomic_write, dumps, read_json
 
 logger = logging.getLogger(__name__)
 
@@ -12,23 +17,31 @@ class UserManager:
     """Manages user wallets and transactions"""
 
     def __init__(self):
-        self.config = BotConfig()
+        self.config = CONFIG
         self.users_file = 'data/users.json'
-        self.ensure_data_directory()
+        self._totals = {'balance': 0.0, 'buxcoin': 0.0, 'bitcoin': 0.0}
+        self._dirty = False
+        self._save_handle = None
+        # Saves can run from the debounce timer's worker thread and the event loop
+        self._save_lock = threading.Lock()
         self.load_users()
-
-    def ensure_data_directory(self):
-        """Ensure the data directory exists"""
-        if not os.path.exists(self.config.DATA_DIR):
-            os.makedirs(self.config.DATA_DIR)
-            logger.info(f"Created data directory: {self.config.DATA_DIR}")
+        atexit.register(self.flush)
 
     def load_users(self):
-        """Load user data from JSON file or initialize empty"""
+        """Load user data from JSON file or initialize empty
+
+        An unreadable users.json is moved aside (users.json.corrupt-<timestamp>) and
+        the manager starts empty, so the backup restore can take over and saves go on.
+        """
         try:
             if os.path.exists(self.users_file):
-                with open(self.users_file, 'r') as f:
-                    self.users = json.load(f)
+                raw_users = read_json(self.users_file)
+                self.users = self.int_keyed(raw_users)
+                self.normalize_wallets()
+                self.recompute_totals()
+                if len(self.users) != len(raw_users):
+                    # The next save drops those entries, keep the original file for inspection
+                    shutil.copyfile(self.users_file, self.corrupt_path())
                 logger.info("Loaded user data from file")
             else:
                 self.users = {}
@@ -37,19 +50,145 @@ class UserManager:
         except Exception as e:
             logger.error(f"Error loading users: {e}")
             self.users = {}
+            self.recompute_totals()
+            try:
+                corrupt_path = self.corrupt_path()
+                os.replace(self.users_file, corrupt_path)
+                logger.warning(f"Moved unreadable users file to {corrupt_path}")
+            except OSError as move_error:
+                logger.error(f"Could not move unreadable users file aside: {move_error}")
+
+    def corrupt_path(self) -> str:
+        """Path to keep a users.json that couldn't be loaded as is"""
+        return f"{self.users_file}.corrupt-{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
 
     def save_users(self):
-        """Save user data to JSON file"""
+        """Save user data to JSON file (atomically, via a temporary file)"""
+        with self._save_lock:
+            self._write_users()
+
+    def _write_users(self):
+        """Encode and write users.json, the caller holds _save_lock"""
+        # Cleared before encoding, so changes made while writing mark the data dirty again
+        self._dirty = False
         try:
-            with open(self.users_file, 'w') as f:
-                json.dump(self.users, f, indent=2)
+            # Encode in one call before touching the file, so the write is a single syscall
+            # Compact by default (every wallet holds up to 50 transactions); USERS_JSON_PRETTY=1 keeps it indented
+            atomic_write(self.users_file, dumps(self.users, pretty=bool(os.getenv('USERS_JSON_PRETTY'))))
             logger.info("Saved user data to file")
         except Exception as e:
+            self._dirty = True
             logger.error(f"Error saving users: {e}")
 
-    def get_user_wallet(self, user_id: str) -> Dict:
+    @property
+    def dirty(self) -> bool:
+        """Whether there are user changes not yet written to disk"""
+        return self._dirty
+
+    def flush(self):
+        """Write pending user changes to disk, if any"""
+        if self._dirty:
+            self.save_users()
+
+    def schedule_save(self):
+        """Mark user data as changed and write it shortly, off the event loop
+
+        Changes made within SAVE_DEBOUNCE_SECONDS share a single write. Without a
+        running event loop (startup, shutdown) the write happens immediately.
+        """
+        self._dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save_users()
+            return
+        if self._save_handle is None:
+            self._save_handle = loop.call_later(self.config.SAVE_DEBOUNCE_SECONDS, self._save_later)
+
+    def _save_later(self):
+        """Debounce timer callback: flush pending changes in a worker thread"""
+        self._save_handle = None
+        if self._dirty:
+            asyncio.get_running_loop().run_in_executor(None, self.flush)
+
+    def normalize_wallets(self):
+        """Make sure every wallet has all balance/holding keys and a transaction list"""
+        for wallet in self.users.values():
+            wallet.setdefault('balance', 0.0)
+            wallet.setdefault('buxcoin', 0.0)
+            wallet.setdefault('bitcoin', 0.0)
+            wallet.setdefault('transactions', [])
+
+    def recompute_totals(self):
+        """Rebuild the running balance/holding totals from scratch (wallets must be normalized)"""
+        balance = buxcoin = bitcoin = 0.0
+        for wallet in self.users.values():
+            balance += wallet['balance']
+            buxcoin += wallet['buxcoin']
+            bitcoin += wallet['bitcoin']
+        self._totals = {'balance': balance, 'buxcoin': buxcoin, 'bitcoin': bitcoin}
+
+    @property
+    def user_count(self) -> int:
+        """Number of users with a wallet"""
+        return len(self.users)
+
+    def get_totals(self) -> Dict[str, float]:
+        """Get the summed balance and holdings of all users"""
+        return self._totals.copy()
+
+    @staticmethod
+    def int_keyed(users: Dict) -> Dict[int, Dict]:
+        """Re-key user data loaded from JSON (string keys) by integer Discord ID
+
+        Entries whose key is not a valid ID are skipped (and logged), not fatal.
+        """
+        keyed = {}
+        for user_id, wallet in users.items():
+            try:
+                keyed[int(user_id)] = wallet
+            except (TypeError, ValueError):
+                logger.warning(f"Skipping user entry with invalid ID: {user_id!r}")
+        if len(keyed) != len(users):
+            logger.warning(f"Dropped {len(users) - len(keyed)} user entries with invalid IDs")
+        return keyed
+
+    def set_users(self, users: Dict):
+        """Replace all user data (e.g. when restoring a backup)
+
+        If the new data is unusable, the current data is kept and the error raised.
+        """
+        previous = self.users
+        self.users = self.int_keyed(users)
+        try:
+            self.normalize_wallets()
+            self.recompute_totals()
+        except Exception:
+            self.users = previous
+            self.recompute_totals()
+            raise
+        self._dirty = True
+        self.save_users()
+
+    def reset_user(self, user_id: int):
+        """Reset a user's wallet to default values"""
+        user_id = int(user_id)
+        old_wallet = self.users.get(user_id)
+        if old_wallet:
+            for key in self._totals:
+                self._totals[key] -= old_wallet.get(key, 0)
+        self.users[user_id] = {
+            'balance': self.config.INITIAL_BALANCE,
+            'buxcoin': 0.0,
+            'bitcoin': 0.0,
+            'transactions': []
+        }
+        self._totals['balance'] += self.config.INITIAL_BALANCE
+        self.schedule_save()
+
+    def get_user_wallet(self, user_id: int) -> Dict:
         """Get user's wallet, create if doesn't exist"""
-        user_id = str(user_id)
+        user_id = int(user_id)
         if user_id not in self.users:
             self.users[user_id] = {
                 'balance': self.config.INITIAL_BALANCE,  # Starting balance
@@ -57,19 +196,33 @@ class UserManager:
                 'bitcoin': 0.0,
                 'transactions': []
             }
-            self.save_users()
+            self._totals['balance'] += self.config.INITIAL_BALANCE
+            # A fresh wallet holds only defaults: no write of its own, it goes out with
+            # the next save (mutators schedule one) or the exit flush
+            self._dirty = True
         return self.users[user_id]
 
-    def update_balance(self, user_id: str, amount: float) -> bool:
+    def update_balance(self, user_id: int, amount: float) -> bool:
         """Update user's balance"""
-        user_id = str(user_id)
+        return self.adjust_balance(user_id, amount)[0]
+
+    def adjust_balance(self, user_id: int, amount: float) -> Tuple[bool, Dict]:
+        """Update user's balance and return (success, wallet) in one step
+
+        Fails without changing anything if the balance would go negative.
+        """
+        user_id = int(user_id)
         wallet = self.get_user_wallet(user_id)
+        # inf/nan would poison the balance (and can't be stored as JSON)
+        if not math.isfinite(amount):
+            return False, wallet
         new_balance = wallet['balance'] + amount
 
         if new_balance < 0:
-            return False
+            return False, wallet
 
         wallet['balance'] = new_balance
+        self._totals['balance'] += amount
 
         # Record admin transaction if it's a significant change
         if abs(amount) > 0:
@@ -79,21 +232,24 @@ class UserManager:
                 'new_balance': new_balance,
                 'timestamp': datetime.now().isoformat()
             }
-            wallet['transactions'].append(transaction)
+            self.record_transaction(wallet, transaction)
 
-            # Keep only last 50 transactions
-            if len(wallet['transactions']) > 50:
-                wallet['transactions'] = wallet['transactions'][-50:]
+        self.schedule_save()
+        return True, wallet
 
-        self.save_users()
-        return True
+    def record_transaction(self, wallet: Dict, transaction: Dict):
+        """Append a transaction, keeping only the last TRANSACTION_HISTORY_LIMIT"""
+        transactions = wallet['transactions']
+        transactions.append(transaction)
+        # Trim in place rather than rebuilding the list with a slice
+        del transactions[:-self.config.TRANSACTION_HISTORY_LIMIT]
 
-    def update_currency(self, user_id: str, currency: str, amount: float) -> bool:
+    def update_currency(self, user_id: int, currency: str, amount: float) -> bool:
         """Update user's currency holdings"""
-        user_id = str(user_id)
+        user_id = int(user_id)
         currency = currency.lower()
 
-        if currency not in ['buxcoin', 'bitcoin']:
+        if currency not in self.config.VALID_CURRENCIES or not math.isfinite(amount):
             return False
 
         wallet = self.get_user_wallet(user_id)
@@ -103,19 +259,29 @@ class UserManager:
             return False
 
         wallet[currency] = new_amount
-        self.save_users()
+        self._totals[currency] += amount
+        self.schedule_save()
         return True
 
-    def buy_currency(self, user_id: str, currency: str, amount: float, price_per_unit: float) -> bool:
+    def _apply_trade(self, wallet: Dict, currency: str, balance_delta: float, currency_delta: float, transaction: Dict):
+        """Apply a validated buy/sell to a wallet and the running totals, record it and schedule a save"""
+        wallet['balance'] += balance_delta
+        wallet[currency] += currency_delta
+        self._totals['balance'] += balance_delta
+        self._totals[currency] += currency_delta
+        self.record_transaction(wallet, transaction)
+        self.schedule_save()
+
+    def buy_currency(self, user_id: int, currency: str, amount: float, price_per_unit: float) -> bool:
         """Buy currency for user"""
-        user_id = str(user_id)
+        user_id = int(user_id)
         currency = currency.lower()
 
-        if currency not in ['buxcoin', 'bitcoin']:
+        if currency not in self.config.VALID_CURRENCIES:
             return False
 
         # Validate minimum amount (0.0001)
-        if amount < 0.0001:
+        if not math.isfinite(amount) or amount < 0.0001:
             return False
 
         total_cost = amount * price_per_unit
@@ -125,37 +291,26 @@ class UserManager:
             return False
 
         # Deduct money and add currency
-        wallet['balance'] -= total_cost
-        wallet[currency] += amount
-
-        # Record transaction
-        transaction = {
+        self._apply_trade(wallet, currency, -total_cost, amount, {
             'type': 'buy',
             'currency': currency,
             'amount': amount,
             'price_per_unit': price_per_unit,
             'total_cost': total_cost,
             'timestamp': datetime.now().isoformat()
-        }
-        wallet['transactions'].append(transaction)
-
-        # Keep only last 50 transactions
-        if len(wallet['transactions']) > 50:
-            wallet['transactions'] = wallet['transactions'][-50:]
-
-        self.save_users()
+        })
         return True
 
-    def sell_currency(self, user_id: str, currency: str, amount: float, price_per_unit: float) -> bool:
+    def sell_currency(self, user_id: int, currency: str, amount: float, price_per_unit: float) -> bool:
         """Sell currency for user"""
-        user_id = str(user_id)
+        user_id = int(user_id)
         currency = currency.lower()
 
-        if currency not in ['buxcoin', 'bitcoin']:
+        if currency not in self.config.VALID_CURRENCIES:
             return False
 
         # Validate minimum amount (0.0001)
-        if amount < 0.0001:
+        if not math.isfinite(amount) or amount < 0.0001:
             return False
 
         wallet = self.get_user_wallet(user_id)
@@ -166,25 +321,14 @@ class UserManager:
         total_value = amount * price_per_unit
 
         # Add money and remove currency
-        wallet['balance'] += total_value
-        wallet[currency] -= amount
-
-        # Record transaction
-        transaction = {
+        self._apply_trade(wallet, currency, total_value, -amount, {
             'type': 'sell',
             'currency': currency,
             'amount': amount,
             'price_per_unit': price_per_unit,
             'total_value': total_value,
             'timestamp': datetime.now().isoformat()
-        }
-        wallet['transactions'].append(transaction)
-
-        # Keep only last 50 transactions
-        if len(wallet['transactions']) > 50:
-            wallet['transactions'] = wallet['transactions'][-50:]
-
-        self.save_users()
+        })
         return True
 
     def get_all_users(self) -> Dict:
@@ -197,8 +341,24 @@ class UserManager:
             backup_filename = f"{prefix}_users_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
             backup_path = os.path.join(self.config.DATA_DIR, backup_filename)
 
-            with open(backup_path, 'w') as f:
-                json.dump(self.users, f, indent=2)
+            # users.json is only ever replaced, never rewritten in place, so once it is
+            # up to date a hard link to it is a stable snapshot with nothing to encode.
+            # Holding the save lock keeps a worker-thread save from racing the link.
+            with self._save_lock:
+                if self._dirty:
+                    self._write_users()
+                if self._dirty:
+                    # The save failed, back up the in-memory data instead
+                    atomic_write(backup_path, dumps(self.users, pretty=bool(os.getenv('USERS_JSON_PRETTY'))))
+                else:
+                    # A backup with the same name (same second) is replaced
+                    if os.path.lexists(backup_path):
+                        os.unlink(backup_path)
+                    try:
+                        os.link(self.users_file, backup_path)
+                    except OSError:
+                        # No hard links on this filesystem, fall back to a plain copy
+                        shutil.copyfile(self.users_file, backup_path)
 
             logger.info(f"Created user backup: {backup_filename}")
             return backup_filename